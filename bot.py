@@ -1,156 +1,312 @@
 import os
 import asyncio
-import json
+import html
 import logging
+import re
+from bisect import bisect_left
+from functools import lru_cache, wraps
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.constants import ParseMode
 from telegram.ext import (
-    Application, CommandHandler, MessageHandler,
+    AIORateLimiter, Application, CommandHandler, MessageHandler,
     CallbackQueryHandler, ContextTypes, filters
 )
+from telegram.request import HTTPXRequest
 from scanner import scan_token, get_dev_alpha
 from smartmoney import find_smart_money, format_smart_money_report
 from clusters import find_wallet_clusters, format_cluster_report
 from monitor import run_monitor, add_monitor_user, remove_monitor_user, is_monitoring, get_monitor_count
 from evm_scanner import scan_evm_token
 from evm_monitor import run_evm_monitor, add_evm_monitor_user, remove_evm_monitor_user, is_evm_monitoring
-from chain_detector import detect_chain, chain_emoji, chain_name, get_explorer_url, get_dex_url, is_evm_address
+from chain_detector import (detect_chain, cached_chain, chain_emoji, chain_name,
+    get_explorer_url, urls_for, is_solana_address, close_chain_db)
 from mirror import (add_mirror_wallet, remove_mirror_wallet, set_budget, get_budget,
     get_user_wallets, run_mirror_monitor, format_mirror_list, format_mirror_alert)
 from sniper import (enable_sniper, disable_sniper, get_filters, update_filter,
     is_sniping, evaluate_and_alert, format_sniper_alert, run_sniper_poller)
-from watchlist import add_to_watchlist, remove_from_watchlist, get_watchlist, check_watchlist_alerts
-from invites import generate_invite, use_invite, is_authorized, authorize_user, list_invites
+from watchlist import add_to_watchlist, remove_from_watchlist, get_watchlist, check_watchlist_alerts, flush_watchlist
+from invites import generate_invites, use_invite, authorize_user, invite_summary, authorized_set
+from http_client import get_http_session, close_http_session
+from cache import ttl_cache
+
+try:
+    import uvloop
+except ImportError:  # optional; not available on Windows
+    uvloop = None
+
+# Scan results are reused briefly so a burst of /scan on a trending token
+# makes one upstream call instead of one per user.
+scan_token     = ttl_cache(60)(scan_token)
+scan_evm_token = ttl_cache(60)(scan_evm_token)
+get_dev_alpha  = ttl_cache(300)(get_dev_alpha)
 
 logging.basicConfig(level=logging.INFO)
+# httpx logs every Bot API request (each getUpdates poll, each send) at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 TELEGRAM_TOKEN = os.environ["TELEGRAM_TOKEN"]
 ADMIN_ID = int(os.environ.get("ADMIN_ID", "0"))
 BOT_USERNAME = os.environ.get("BOT_USERNAME", "chainsentinel_bot").lstrip("@")
+# Public HTTPS base URL (behind a reverse proxy). When set, Telegram pushes
+# updates to us; otherwise we fall back to long polling.
+WEBHOOK_URL = os.environ.get("WEBHOOK_URL", "").rstrip("/")
+WEBHOOK_PORT = int(os.environ.get("WEBHOOK_PORT", "8443"))
+WEBHOOK_SECRET = os.environ.get("WEBHOOK_SECRET") or None
+ALERT_SEND_CONCURRENCY = 25
+TG_POOL_SIZE = 64
+# Telegram rejects messages over 4096 chars; leave headroom for entities
+MAX_MESSAGE_LEN = 4000
+
+_WELCOME_TMPL = (
+    "👁 <b>CHAIN SENTINEL</b> — Welcome, {name}\n\n"
+    "Send me any Solana contract address and I'll scan it for:\n"
+    "• Wallet clustering &amp; snipers\n"
+    "• LP lock status\n"
+    "• Supply concentration\n"
+    "• MEV bot exposure\n\n"
+    "<b>Commands:</b>\n"
+    "/scan <code>&lt;CA&gt;</code> — Full risk scan\n"
+    "/dev <code>&lt;CA&gt;</code> — Dev history &amp; alpha\n"
+    "/smartmoney <code>&lt;CA1&gt; &lt;CA2&gt;</code> — Find smart money wallets\n"
+    "/cluster <code>&lt;CA&gt;</code> — Detect cabal wallet clusters\n"
+    "/monitor — Live pump.fun launch alerts\n"
+    "/mirror — Whale mirror trading\n"
+    "/unmonitor — Stop live alerts\n"
+    "/watch <code>&lt;CA&gt;</code> — Add to watchlist\n"
+    "/unwatch <code>&lt;CA&gt;</code> — Remove from watchlist\n"
+    "/watchlist — View your watchlist\n\n"
+    "<i>Paste a contract address to get started ↓</i>"
+)
+
+_ADMIN_ONLY_MSG = "⛔ Admin only."
+_SCAN_USAGE = "Usage: /scan <contract_address>"
+_WATCH_USAGE = "Usage: /watch <contract_address>"
+_UNWATCH_USAGE = "Usage: /unwatch <contract_address>"
+_WATCHLIST_EMPTY_MSG = "Your watchlist is empty. Use /watch <CA> to add tokens."
+_DEV_USAGE = "Usage: /dev <contract_address>\n\nExample: /dev 8JnBeGkvs1XGLquaLcrZ9i4UCPjiDa2fSR1uv6k8pump"
+_SMARTMONEY_USAGE = (
+    "🧠 *Smart Money Finder*\n\n"
+    "Find wallets holding multiple successful tokens with high win rates.\n\n"
+    "Usage: `/smartmoney <CA1> <CA2> [CA3] [CA4] [CA5]`\n\n"
+    "Example: paste 2-5 contract addresses separated by spaces.\n"
+    "_Minimum 2 CAs required._"
+)
+_CLUSTER_USAGE = (
+    "🕸 *Wallet Cluster Detector*\n\n"
+    "Finds coordinated wallets funded by the same source (cabals).\n\n"
+    "Usage: `/cluster <contract_address>`"
+)
+_MONITOR_ALREADY_MSG = "👁 You are already receiving live launch alerts.\nUse /unmonitor to stop."
+_MONITOR_ON_MSG = (
+    "✅ *Live Monitor ON*\n\n"
+    "You will now receive instant alerts for:\n"
+    "• 🟣 Solana — pump.fun new launches\n"
+    "• 🔵 Base — Uniswap new pairs\n"
+    "• ⟠ Ethereum — Uniswap new pairs\n\n"
+    "Filter: must have socials + optional bullish dev\n\n"
+    "Use /unmonitor to stop alerts."
+)
+_MONITOR_OFF_MSG = "🔕 Live monitor disabled for all chains. Use /monitor to re-enable."
+
+_ACCESS_DENIED_MSG = (
+    "🔒 <b>Access Denied</b>\n\nChain Sentinel is invite-only.\nYou need a valid invite link to access this bot."
+)
+
+@lru_cache(maxsize=4096)
+def _short(addr: str) -> str:
+    return f"{addr[:8]}...{addr[-4:]}"
+
+
+def _pages(text: str, limit: int = MAX_MESSAGE_LEN) -> list:
+    """Split text into message-sized pages, breaking on line boundaries."""
+    pages = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        if cut <= 0:
+            cut = limit
+        pages.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    pages.append(text)
+    return pages
+
+
+async def _edit_paged(msg, text: str, **kwargs):
+    """Edit msg with the first page of text and send the rest as follow-ups."""
+    first, *rest = _pages(text)
+    await msg.edit_text(first, **kwargs)
+    for page in rest:
+        await msg.reply_text(page, **kwargs)
+
+
+async def _reply_paged(msg, text: str, **kwargs):
+    for page in _pages(text):
+        await msg.reply_text(page, **kwargs)
+
+
+def _esc(value) -> str:
+    """Escape a dynamic value for HTML parse mode."""
+    return html.escape(str(value), quote=False)
+
+
+# EVM (0x + 40 hex) or Solana (32-44 base58) contract address, in one match
+_ADDR_RE = re.compile(r"^(?:0x[0-9a-fA-F]{40}|[1-9A-HJ-NP-Za-km-z]{32,44})$")
+_B58 = is_solana_address
+
+_WATCHLIST_HEADER = "👁 <b>Your Watchlist:</b>\n\n"
+_SCAN_BUSY_MSG = "⏳ You already have a scan running — wait for it to finish."
+
+_BTN_WATCH_LABEL    = "👁 Watch Token"
+_BTN_WATCHING_LABEL = "✅ Watching"
+_BTN_PUMPFUN_LABEL  = "🔗 Pump.fun"
+_BTN_BUY_LABEL      = "🛒 Buy"
+_BTN_DEXSCR_LABEL   = "📊 DexScreener"
+
+
+@lru_cache(maxsize=1024)
+def _watching_markup(ca: str) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup([[
+        InlineKeyboardButton(_BTN_WATCHING_LABEL, callback_data="noop"),
+        InlineKeyboardButton(_BTN_PUMPFUN_LABEL, url=f"https://pump.fun/coin/{ca}")
+    ]])
+
+
+AUTHORIZED = authorized_set()
 
 
 def require_auth(func):
+    @wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
         user_id = update.effective_user.id
-        if user_id == ADMIN_ID or is_authorized(user_id):
+        if user_id == ADMIN_ID or user_id in AUTHORIZED:
             return await func(update, context)
         else:
-            await update.message.reply_text(
-                "🔒 *Access Denied*\n\nChain Sentinel is invite-only.\nYou need a valid invite link to access this bot.",
-                parse_mode="Markdown"
-            )
+            await update.message.reply_text(_ACCESS_DENIED_MSG, parse_mode=ParseMode.HTML)
+    return wrapper
+
+
+def _scan_sem(context: ContextTypes.DEFAULT_TYPE) -> asyncio.Semaphore:
+    sem = context.user_data.get("scan_sem")
+    if sem is None:
+        sem = context.user_data["scan_sem"] = asyncio.Semaphore(1)
+    return sem
+
+
+def one_scan_per_user(func):
+    """Let each user run one heavy scan at a time so repeats can't stack on the RPC quota."""
+    @wraps(func)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        sem = _scan_sem(context)
+        if sem.locked():
+            await update.effective_message.reply_text(_SCAN_BUSY_MSG)
+            return
+        async with sem:
+            return await func(update, context)
+    return wrapper
+
+
+def one_scan_per_user_cb(func):
+    """one_scan_per_user for inline-button callbacks, which share the user's scan slot."""
+    @wraps(func)
+    async def wrapper(query, context, ca):
+        sem = _scan_sem(context)
+        if sem.locked():
+            await query.message.reply_text(_SCAN_BUSY_MSG)
+            return
+        async with sem:
+            return await func(query, context, ca)
     return wrapper
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    user_id = update.effective_user.id
-    user_name = update.effective_user.first_name or "trader"
+    user = update.effective_user
+    user_id = user.id
+    user_name = _esc(user.first_name or "trader")
 
     if context.args:
         token = context.args[0]
-        if is_authorized(user_id) or user_id == ADMIN_ID:
+        if user_id == ADMIN_ID or user_id in AUTHORIZED:
             await send_welcome(update, user_name)
             return
-        success = use_invite(token, user_id)
+        success = await asyncio.to_thread(use_invite, token, user_id)
         if success:
             await update.message.reply_text(
-                f"✅ *Invite accepted!* Welcome, {user_name}.\n\nYou now have full access to Chain Sentinel.",
-                parse_mode="Markdown"
+                f"✅ <b>Invite accepted!</b> Welcome, {user_name}.\n\nYou now have full access to Chain Sentinel.",
+                parse_mode=ParseMode.HTML
             )
             await send_welcome(update, user_name)
         else:
             await update.message.reply_text(
-                "❌ *Invalid or already used invite link.*\n\nThis link has already been redeemed.\nContact the admin for a new invite.",
-                parse_mode="Markdown"
+                "❌ <b>Invalid or already used invite link.</b>\n\nThis link has already been redeemed.\nContact the admin for a new invite.",
+                parse_mode=ParseMode.HTML
             )
         return
 
-    if is_authorized(user_id) or user_id == ADMIN_ID:
+    if user_id == ADMIN_ID or user_id in AUTHORIZED:
         await send_welcome(update, user_name)
     else:
         await update.message.reply_text(
-            "🔒 *Chain Sentinel is invite-only.*\n\nYou need a valid invite link to access this bot.",
-            parse_mode="Markdown"
+            "🔒 <b>Chain Sentinel is invite-only.</b>\n\nYou need a valid invite link to access this bot.",
+            parse_mode=ParseMode.HTML
         )
 
 
 async def send_welcome(update: Update, name: str):
-    text = (
-        f"👁 *CHAIN SENTINEL* — Welcome, {name}\n\n"
-        "Send me any Solana contract address and I'll scan it for:\n"
-        "• Wallet clustering & snipers\n"
-        "• LP lock status\n"
-        "• Supply concentration\n"
-        "• MEV bot exposure\n\n"
-        "*Commands:*\n"
-        "/scan `<CA>` — Full risk scan\n"
-        "/dev `<CA>` — Dev history & alpha\n"
-        "/smartmoney `<CA1> <CA2>` — Find smart money wallets\n"
-        "/cluster `<CA>` — Detect cabal wallet clusters\n"
-        "/monitor — Live pump.fun launch alerts\n"
-        "/mirror — Whale mirror trading\n"
-        "/unmonitor — Stop live alerts\n"
-        "/watch `<CA>` — Add to watchlist\n"
-        "/unwatch `<CA>` — Remove from watchlist\n"
-        "/watchlist — View your watchlist\n\n"
-        "_Paste a contract address to get started ↓_"
-    )
-    await update.message.reply_text(text, parse_mode="Markdown")
+    await update.message.reply_text(_WELCOME_TMPL.format(name=name), parse_mode=ParseMode.HTML)
 
 
 async def genlink_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if update.effective_user.id != ADMIN_ID:
-        await update.message.reply_text("⛔ Admin only.")
+        await update.message.reply_text(_ADMIN_ONLY_MSG)
         return
     count = 1
     if context.args and context.args[0].isdigit():
         count = min(int(context.args[0]), 20)
-    lines = [f"🔑 *Generated {count} invite link(s):*\n"]
-    for _ in range(count):
-        token = generate_invite()
+    lines = [f"🔑 <b>Generated {count} invite link(s):</b>\n"]
+    for token in await asyncio.to_thread(generate_invites, count):
         link = f"https://t.me/{BOT_USERNAME}?start={token}"
-        lines.append(f"`{link}`")
-    lines.append("\n_Each link can only be used once._")
-    await update.message.reply_text("\n".join(lines), parse_mode="Markdown")
+        lines.append(f"<code>{link}</code>")
+    lines.append("\n<i>Each link can only be used once.</i>")
+    await update.message.reply_text("\n".join(lines), parse_mode=ParseMode.HTML)
 
 
 async def invites_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if update.effective_user.id != ADMIN_ID:
-        await update.message.reply_text("⛔ Admin only.")
+        await update.message.reply_text(_ADMIN_ONLY_MSG)
         return
-    invites = list_invites()
-    if not invites:
+    total, used, recent = await asyncio.to_thread(invite_summary, 10)
+    if not total:
         await update.message.reply_text("No invites yet. Use /genlink to create one.")
         return
-    used = sum(1 for v in invites.values() if v["used"])
-    unused = len(invites) - used
-    lines = [f"📋 *Invite Summary:*", f"Total: {len(invites)} | Used: {used} | Available: {unused}\n"]
-    for token, meta in list(invites.items())[-10:]:
-        status = "✅ Used" if meta["used"] else "⏳ Available"
-        lines.append(f"`...{token[-8:]}` — {status}")
-    await update.message.reply_text("\n".join(lines), parse_mode="Markdown")
+    unused = total - used
+    lines = [f"📋 <b>Invite Summary:</b>", f"Total: {total} | Used: {used} | Available: {unused}\n"]
+    for token, is_used in recent:
+        status = "✅ Used" if is_used else "⏳ Available"
+        lines.append(f"<code>...{token[-8:]}</code> — {status}")
+    await update.message.reply_text("\n".join(lines), parse_mode=ParseMode.HTML)
 
 
 async def adduser_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if update.effective_user.id != ADMIN_ID:
-        await update.message.reply_text("⛔ Admin only.")
+        await update.message.reply_text(_ADMIN_ONLY_MSG)
         return
     if not context.args or not context.args[0].isdigit():
         await update.message.reply_text("Usage: /adduser <telegram_user_id>")
         return
-    authorize_user(int(context.args[0]))
-    await update.message.reply_text(f"✅ User `{context.args[0]}` authorized.", parse_mode="Markdown")
+    await asyncio.to_thread(authorize_user, int(context.args[0]))
+    await update.message.reply_text(f"✅ User <code>{context.args[0]}</code> authorized.", parse_mode=ParseMode.HTML)
 
 
 @require_auth
 async def help_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    await send_welcome(update, update.effective_user.first_name or "trader")
+    await send_welcome(update, _esc(update.effective_user.first_name or "trader"))
 
 
 @require_auth
+@one_scan_per_user
 async def scan_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not context.args:
-        await update.message.reply_text("Usage: /scan <contract_address>")
+        await update.message.reply_text(_SCAN_USAGE)
         return
     await run_scan(update, context, context.args[0].strip())
 
@@ -158,372 +314,469 @@ async def scan_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
 @require_auth
 async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     text = update.message.text.strip()
-    from chain_detector import is_evm_address, is_solana_address
-    if is_evm_address(text) or (32 <= len(text) <= 44 and is_solana_address(text)):
-        await run_scan(update, context, text)
+    if _ADDR_RE.match(text):
+        sem = _scan_sem(context)
+        if sem.locked():
+            await update.message.reply_text(_SCAN_BUSY_MSG)
+            return
+        async with sem:
+            await run_scan(update, context, text)
     else:
         await update.message.reply_text("Send me a Solana, Base, or Ethereum contract address to scan, or use /help.")
 
 
+# Markups are never mutated after being sent, so one instance per CA is shared
+@lru_cache(maxsize=1024)
+def _scan_markup(ca: str, chain: str) -> InlineKeyboardMarkup:
+    explorer_url, dex_url = urls_for(ca, chain)
+    if chain == "solana":
+        return InlineKeyboardMarkup([[
+            InlineKeyboardButton(_BTN_WATCH_LABEL, callback_data=f"watch:{ca}"),
+            InlineKeyboardButton(_BTN_PUMPFUN_LABEL, url=dex_url)
+        ]])
+    return InlineKeyboardMarkup([[
+        InlineKeyboardButton(_BTN_WATCH_LABEL, callback_data=f"watch:{ca}"),
+        InlineKeyboardButton(_BTN_BUY_LABEL, url=dex_url),
+    ],[
+        InlineKeyboardButton(f"{chain_emoji(chain)} Explorer", url=explorer_url),
+        InlineKeyboardButton(_BTN_DEXSCR_LABEL, url=f"https://dexscreener.com/{chain}/{ca}"),
+    ]])
+
+
+@lru_cache(maxsize=1024)
+def _dev_markup(ca: str, deployer: str) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup([[
+        InlineKeyboardButton("🔍 Full Scan", callback_data=f"scan:{ca}"),
+        InlineKeyboardButton("👁 Solscan", url=f"https://solscan.io/account/{deployer}")
+    ]])
+
+
+def _render_scan(ca: str, chain: str, result: dict) -> tuple:
+    if chain == "solana":
+        text = format_report(ca, result)
+    else:
+        text = format_evm_report(ca, chain, result, chain_emoji(chain), chain_name(chain))
+    return text, _scan_markup(ca, chain)
+
+
+def _cached_scan(ca: str):
+    """Return (chain, result) if both are still cached, else None."""
+    chain = cached_chain(ca)
+    if chain == "solana":
+        result = scan_token.cache.get((ca,))
+    elif chain in ("base", "ethereum"):
+        result = scan_evm_token.cache.get((ca, chain))
+    else:
+        return None
+    return (chain, result) if result is not None else None
+
+
 async def run_scan(update: Update, context: ContextTypes.DEFAULT_TYPE, ca: str):
     msg_obj = update.message if update.message else update.callback_query.message
+
+    # Cache hit: one reply with the finished report, no placeholder + edits
+    cached = _cached_scan(ca)
+    if cached:
+        text, markup = _render_scan(ca, *cached)
+        await msg_obj.reply_text(text, parse_mode=ParseMode.HTML,
+            reply_markup=markup, disable_web_page_preview=True)
+        return
+
     msg = await msg_obj.reply_text(
-        f"🔍 Detecting chain for `{ca[:8]}...{ca[-4:]}`...",
-        parse_mode="Markdown"
+        f"🔍 Detecting chain for <code>{_esc(_short(ca))}</code>...",
+        parse_mode=ParseMode.HTML
     )
     try:
         chain = await detect_chain(ca)
-        cemoji = chain_emoji(chain)
-        cname  = chain_name(chain)
+        if chain not in ("solana", "base", "ethereum"):
+            await msg.edit_text(
+                "❌ Unknown chain. Send a valid Solana, Base, or Ethereum contract address.",
+                parse_mode=ParseMode.HTML
+            )
+            return
 
         await msg.edit_text(
-            f"{cemoji} Scanning `{ca[:8]}...{ca[-4:]}` on *{cname}*\nFetching token data...",
-            parse_mode="Markdown"
+            f"{chain_emoji(chain)} Scanning <code>{_esc(_short(ca))}</code> on <b>{chain_name(chain)}</b>\nFetching token data...",
+            parse_mode=ParseMode.HTML
         )
 
         if chain == "solana":
-            result  = await scan_token(ca)
-            text    = format_report(ca, result)
-            buttons = [[
-                InlineKeyboardButton("👁 Watch Token", callback_data=f"watch:{ca}"),
-                InlineKeyboardButton("🔗 Pump.fun", url=get_dex_url(ca, chain))
-            ]]
-        elif chain in ("base", "ethereum"):
-            result  = await scan_evm_token(ca, chain)
-            text    = format_evm_report(ca, chain, result)
-            buttons = [[
-                InlineKeyboardButton("👁 Watch Token", callback_data=f"watch:{ca}"),
-                InlineKeyboardButton("🛒 Buy", url=get_dex_url(ca, chain)),
-            ],[
-                InlineKeyboardButton(f"{cemoji} Explorer", url=get_explorer_url(ca, chain)),
-                InlineKeyboardButton("📊 DexScreener", url=f"https://dexscreener.com/{chain}/{ca}"),
-            ]]
+            result = await scan_token(ca)
         else:
-            await msg.edit_text(
-                "❌ Unknown chain. Send a valid Solana, Base, or Ethereum contract address.",
-                parse_mode="Markdown"
-            )
-            return
+            result = await scan_evm_token(ca, chain)
+        text, markup = _render_scan(ca, chain, result)
 
-        await msg.edit_text(text, parse_mode="Markdown",
-            reply_markup=InlineKeyboardMarkup(buttons), disable_web_page_preview=True)
+        await msg.edit_text(text, parse_mode=ParseMode.HTML,
+            reply_markup=markup, disable_web_page_preview=True)
     except Exception as e:
-        logger.error(f"Scan error: {e}", exc_info=True)
-        await msg.edit_text(f"❌ Scan failed for `{ca[:8]}...`\nCheck the CA and try again.", parse_mode="Markdown")
+        logger.error("Scan error: %s", e, exc_info=True)
+        await msg.edit_text(f"❌ Scan failed for <code>{_esc(ca[:8])}...</code>\nCheck the CA and try again.", parse_mode=ParseMode.HTML)
 
 
-def format_evm_report(ca: str, chain: str, r: dict) -> str:
-    score  = r.get("risk_score", 0)
-    cemoji = chain_emoji(chain)
-    cname  = chain_name(chain)
+def _fmt_mc(mc) -> str:
+    try:
+        mc = float(mc)
+        if mc >= 1_000_000: return f"${mc/1_000_000:.2f}M"
+        elif mc >= 1_000:   return f"${mc/1_000:.1f}K"
+        else:               return f"${mc:.0f}"
+    except Exception:
+        return "N/A"
+
+
+_VERDICT_BOUNDS = (30, 60, 80)
+_VERDICTS = ("🟢 LOW RISK", "🟡 MEDIUM RISK", "🟠 HIGH RISK", "🔴 CRITICAL RISK")
+
+
+def _verdict(score) -> str:
+    return _VERDICTS[bisect_left(_VERDICT_BOUNDS, score)]
+
+
+class _Fields(dict):
+    """Template substitutions — any field the scanner didn't return renders as N/A."""
+    def __missing__(self, key):
+        return "N/A"
+
+
+def _top_tokens(token_lines) -> str:
+    if not token_lines:
+        return ""
+    return "• Top tokens:\n" + "".join(f"  {_esc(tl)}\n" for tl in token_lines[:3])
+
+
+# Report skeletons — filled once per scan with format_map over _Fields.
+_EVM_REPORT_TMPL = (
+    "{cemoji} <b>CHAIN SENTINEL REPORT</b> — {cname}\n"
+    "{header}\n"
+    "<code>{ca}</code>\n"
+    "\n"
+    "<b>Risk Score: {risk_score}/100 — {verdict}</b>\n"
+    "\n"
+    "━━━ 💼 WALLET ACTIVITY ━━━\n"
+    "• Unique wallets (100 txs): <code>{wallet_count}</code>\n"
+    "• Fresh wallets (&lt;24h): <code>{fresh_wallet_pct}%</code>\n"
+    "• Cluster activity: <code>{cluster_pct}%</code>\n"
+    "• Holder risk: <code>{holder_risk}</code>\n"
+    "\n"
+    "━━━ 💧 LIQUIDITY ━━━\n"
+    "• Status: <code>{lp_locked}</code>\n"
+    "• Market Cap: <code>{mc_fmt}</code>\n"
+    "• Volume 24h: <code>{vol_fmt}</code>\n"
+    "• LP risk: <code>{lp_risk}</code>\n"
+    "\n"
+    "━━━ 📊 SUPPLY CONCENTRATION ━━━\n"
+    "• Holder count: <code>{holder_count}</code>\n"
+    "• Top holder: <code>{top1_pct}%</code>\n"
+    "• Top 10 holders: <code>{top10_pct}%</code>\n"
+    "• Gini: <code>{gini}</code>\n"
+    "• Supply risk: <code>{supply_risk}</code>\n"
+    "\n"
+    "━━━ 👨‍💻 DEV HISTORY ━━━\n"
+    "• Deployer: {dev_short}\n"
+    "  <a href='{exp_url}'>View on Explorer</a>\n"
+    "• Deployments (60d): <code>{token_count}</code> ({dead_count} dead)\n"
+    "• Biggest MC: <code>{biggest_mc_fmt}</code>\n"
+    "• Dev rating: {dev_risk}\n"
+    "{top_tokens}"
+    "\n"
+    "━━━ 🤖 ANALYSIS ━━━\n"
+    "{ai_summary}\n"
+    "<i>{dev_summary}</i>\n"
+    "\n"
+    "<i>Powered by Chain Sentinel • $CS</i>"
+)
 
-    if score <= 30:   verdict = "🟢 LOW RISK"
-    elif score <= 60: verdict = "🟡 MEDIUM RISK"
-    elif score <= 80: verdict = "🟠 HIGH RISK"
-    else:             verdict = "🔴 CRITICAL RISK"
+_REPORT_TMPL = (
+    "👁 <b>CHAIN SENTINEL REPORT</b>\n"
+    "{header}\n"
+    "<code>{ca}</code>\n"
+    "\n"
+    "<b>Risk Score: {risk_score}/100 — {verdict}</b>\n"
+    "\n"
+    "━━━ 💼 WALLET ANALYSIS ━━━\n"
+    "• Unique wallets: <code>{wallet_count}</code>\n"
+    "• Clustered/coordinated: <code>{cluster_pct}%</code>\n"
+    "• Fresh wallets (&lt;24h): <code>{fresh_wallet_pct}%</code>\n"
+    "• Wallet risk: <code>{wallet_risk}</code>\n"
+    "\n"
+    "━━━ 💧 LIQUIDITY (LP) ━━━\n"
+    "• LP status: <code>{lp_locked}</code>\n"
+    "• LP risk: <code>{lp_risk}</code>\n"
+    "\n"
+    "━━━ 📊 SUPPLY CONCENTRATION ━━━\n"
+    "• Holder count: <code>{holder_count}</code>\n"
+    "• Top holder: <code>{top1_pct}%</code>\n"
+    "• Top 10 holders: <code>{top10_pct}%</code>\n"
+    "• Gini coefficient: <code>{gini}</code>\n"
+    "• Supply risk: <code>{supply_risk}</code>\n"
+    "\n"
+    "━━━ ⚡ MEV EXPOSURE ━━━\n"
+    "• Suspected bot wallets: <code>{mev_bots}</code>\n"
+    "• Sandwich patterns: <code>{sandwich_count}</code>\n"
+    "• MEV risk: <code>{mev_risk}</code>\n"
+    "\n"
+    "━━━ 👨‍💻 DEV HISTORY ━━━\n"
+    "• Deployer: {dev_short}\n"
+    "• Launches (60d): <code>{token_count}</code> ({dead_count} dead)\n"
+    "• Biggest MC: <code>{biggest_mc_fmt}</code>\n"
+    "• Dev rating: {dev_risk}\n"
+    "{top_tokens}"
+    "\n"
+    "━━━ 🤖 ANALYSIS ━━━\n"
+    "{ai_summary}\n"
+    "<i>{dev_summary}</i>\n"
+    "\n"
+    "<i>Powered by Chain Sentinel • $CS</i>"
+)
 
-    def fmt_mc(mc):
-        try:
-            mc = float(mc)
-            if mc >= 1_000_000: return f"${mc/1_000_000:.2f}M"
-            elif mc >= 1_000:   return f"${mc/1_000:.1f}K"
-            else:               return f"${mc:.0f}"
-        except: return "N/A"
-
-    dev         = r.get("dev", {})
-    deployer    = dev.get("deployer", "N/A") or "N/A"
-    dev_short   = f"`{deployer[:8]}...{deployer[-4:]}`" if len(deployer) > 12 else f"`{deployer}`"
-    dev_risk    = dev.get("risk", "N/A")
-    token_count = dev.get("token_count", 0)
-    dead_count  = dev.get("dead_count", 0)
-    biggest_mc  = dev.get("biggest_mc", 0)
-    token_lines = dev.get("token_lines", [])
-    dev_summary = dev.get("summary", "No dev history found.")
-    exp_url     = get_explorer_url(deployer, chain)
 
-    name   = r.get("token_name", "Unknown")
-    symbol = r.get("token_symbol", "???")
-    header = f"*{name}* (${symbol})" if name != "Unknown" else f"`{ca}`"
-
-    lines = [
-        f"{cemoji} *CHAIN SENTINEL REPORT* — {cname}",
-        f"{header}",
-        f"`{ca}`", f"",
-        f"*Risk Score: {score}/100 — {verdict}*", f"",
-        f"━━━ 💼 WALLET ACTIVITY ━━━",
-        f"• Unique wallets (100 txs): `{r.get('wallet_count', 'N/A')}`",
-        f"• Fresh wallets (<24h): `{r.get('fresh_wallet_pct', 'N/A')}%`",
-        f"• Cluster activity: `{r.get('cluster_pct', 'N/A')}%`",
-        f"• Holder risk: `{r.get('holder_risk', 'N/A')}`", f"",
-        f"━━━ 💧 LIQUIDITY ━━━",
-        f"• Status: `{r.get('lp_locked', 'N/A')}`",
-        f"• Market Cap: `{fmt_mc(r.get('market_cap', 0))}`",
-        f"• Volume 24h: `{fmt_mc(r.get('volume_24h', 0))}`",
-        f"• LP risk: `{r.get('lp_risk', 'N/A')}`", f"",
-        f"━━━ 📊 SUPPLY CONCENTRATION ━━━",
-        f"• Holder count: `{r.get('holder_count', 'N/A')}`",
-        f"• Top holder: `{r.get('top1_pct', 'N/A')}%`",
-        f"• Top 10 holders: `{r.get('top10_pct', 'N/A')}%`",
-        f"• Gini: `{r.get('gini', 'N/A')}`",
-        f"• Supply risk: `{r.get('supply_risk', 'N/A')}`", f"",
-        f"━━━ 👨‍💻 DEV HISTORY ━━━",
-        f"• Deployer: {dev_short}",
-        f"  [View on Explorer]({exp_url})",
-        f"• Deployments (60d): `{token_count}` ({dead_count} dead)",
-        f"• Biggest MC: `{fmt_mc(biggest_mc)}`",
-        f"• Dev rating: {dev_risk}",
-    ]
-
-    if token_lines:
-        lines.append("• Top tokens:")
-        for tl in token_lines[:3]:
-            lines.append(f"  {tl}")
-
-    lines += [
-        f"", f"━━━ 🤖 ANALYSIS ━━━",
-        f"{r.get('ai_summary', '')}",
-        f"_{dev_summary}_",
-        f"", f"_Powered by Chain Sentinel • $CS_"
-    ]
-    return "\n".join(lines)
+_DEV_REPORT_TMPL = (
+    "👨‍💻 <b>DEV ALPHA REPORT</b>\n"
+    "\n"
+    "<b>Deployer:</b> <code>{deployer_short}</code>\n"
+    "<a href='https://solscan.io/account/{deployer}'>View on Solscan</a>\n"
+    "\n"
+    "━━━ 📊 LAUNCH HISTORY (60 days) ━━━\n"
+    "• Total launches: <code>{token_count}</code>\n"
+    "• Dead/untraded: <code>{dead_count}</code>\n"
+    "• Biggest MC: <code>{biggest_mc}</code>\n"
+    "\n"
+    "━━━ ⚠️ DEV RISK ━━━\n"
+    "• Rating: {risk}\n"
+    "• Note: <i>{risk_note}</i>\n"
+    "\n"
+    "{token_block}"
+    "━━━ 🤖 SUMMARY ━━━\n"
+    "{summary}\n"
+    "\n"
+    "<i>Powered by Chain Sentinel • $CS</i>"
+)
 
 
+_DEV_DEFAULTS = {
+    "deployer":    "N/A",
+    "risk":        "N/A",
+    "token_count": 0,
+    "dead_count":  0,
+    "biggest_mc":  0,
+    "token_lines": (),
+    "summary":     "No dev history found.",
+}
 
-def format_report(ca: str, r: dict) -> str:
-    score = r.get("risk_score", 0)
-    if score <= 30:   verdict = "🟢 LOW RISK"
-    elif score <= 60: verdict = "🟡 MEDIUM RISK"
-    elif score <= 80: verdict = "🟠 HIGH RISK"
-    else:             verdict = "🔴 CRITICAL RISK"
 
-    def fmt_mc(mc):
-        try:
-            mc = float(mc)
-            if mc >= 1_000_000: return f"${mc/1_000_000:.2f}M"
-            elif mc >= 1_000:   return f"${mc/1_000:.1f}K"
-            else:               return f"${mc:.0f}"
-        except: return "N/A"
-
-    # Build dev section
-    dev = r.get("dev", {})
-    deployer = dev.get("deployer", "N/A")
-    dev_short = f"`{deployer[:8]}...{deployer[-4:]}`" if deployer and deployer != "N/A" else "`N/A`"
-    dev_risk = dev.get("risk", "N/A")
-    dev_note = dev.get("risk_note", "")
-    token_count = dev.get("token_count", 0)
-    dead_count = dev.get("dead_count", 0)
-    biggest_mc = dev.get("biggest_mc", 0)
-    token_lines = dev.get("token_lines", [])
-    dev_summary = dev.get("summary", "No dev history found.")
+def _report_fields(ca: str, r: dict):
+    f = _Fields({k: _esc(v) if isinstance(v, str) else v for k, v in r.items()})
+    f.setdefault("ai_summary", "")
+    score = r.get("risk_score", 0)
 
+    # One merge instead of a .get(key, default) per dev field
+    dev = {**_DEV_DEFAULTS, **(r.get("dev") or {})}
     name   = r.get("token_name", "Unknown")
     symbol = r.get("token_symbol", "???")
-    header = f"*{name}* (${symbol})" if name != "Unknown" else f"`{ca}`"
-
-    lines = [
-        f"👁 *CHAIN SENTINEL REPORT*",
-        f"{header}",
-        f"`{ca}`", f"",
-        f"*Risk Score: {score}/100 — {verdict}*", f"",
-        f"━━━ 💼 WALLET ANALYSIS ━━━",
-        f"• Unique wallets: `{r.get('wallet_count', 'N/A')}`",
-        f"• Clustered/coordinated: `{r.get('cluster_pct', 'N/A')}%`",
-        f"• Fresh wallets (<24h): `{r.get('fresh_wallet_pct', 'N/A')}%`",
-        f"• Wallet risk: `{r.get('wallet_risk', 'N/A')}`", f"",
-        f"━━━ 💧 LIQUIDITY (LP) ━━━",
-        f"• LP status: `{r.get('lp_locked', 'Unknown')}`",
-        f"• LP risk: `{r.get('lp_risk', 'N/A')}`", f"",
-        f"━━━ 📊 SUPPLY CONCENTRATION ━━━",
-        f"• Holder count: `{r.get('holder_count', 'N/A')}`",
-        f"• Top holder: `{r.get('top1_pct', 'N/A')}%`",
-        f"• Top 10 holders: `{r.get('top10_pct', 'N/A')}%`",
-        f"• Gini coefficient: `{r.get('gini', 'N/A')}`",
-        f"• Supply risk: `{r.get('supply_risk', 'N/A')}`", f"",
-        f"━━━ ⚡ MEV EXPOSURE ━━━",
-        f"• Suspected bot wallets: `{r.get('mev_bots', 'N/A')}`",
-        f"• Sandwich patterns: `{r.get('sandwich_count', 'N/A')}`",
-        f"• MEV risk: `{r.get('mev_risk', 'N/A')}`", f"",
-        f"━━━ 👨‍💻 DEV HISTORY ━━━",
-        f"• Deployer: {dev_short}",
-        f"• Launches (60d): `{token_count}` ({dead_count} dead)",
-        f"• Biggest MC: `{fmt_mc(biggest_mc)}`",
-        f"• Dev rating: {dev_risk}",
-    ]
-
-    if token_lines:
-        lines.append(f"• Top tokens:")
-        for tl in token_lines[:3]:
-            lines.append(f"  {tl}")
-
-    lines += [
-        f"", f"━━━ 🤖 ANALYSIS ━━━",
-        f"{r.get('ai_summary', '')}",
-        f"_{dev_summary}_",
-        f"", f"_Powered by Chain Sentinel • $CS_"
-    ]
-
-    return "\n".join(lines)
+
+    f["ca"]             = _esc(ca)
+    f["risk_score"]     = score
+    f["verdict"]        = _verdict(score)
+    f["header"]         = f"<b>{_esc(name)}</b> (${_esc(symbol)})" if name != "Unknown" else f"<code>{_esc(ca)}</code>"
+    f["dev_risk"]       = _esc(dev["risk"])
+    f["token_count"]    = dev["token_count"]
+    f["dead_count"]     = dev["dead_count"]
+    f["biggest_mc_fmt"] = _fmt_mc(dev["biggest_mc"])
+    f["top_tokens"]     = _top_tokens(dev["token_lines"])
+    f["dev_summary"]    = _esc(dev["summary"])
+    return f, dev
+
+
+def format_evm_report(ca: str, chain: str, r: dict, cemoji: str, cname: str) -> str:
+    f, dev = _report_fields(ca, r)
+    deployer = dev["deployer"] or "N/A"
+
+    f["cemoji"]    = cemoji
+    f["cname"]     = cname
+    f["mc_fmt"]    = _fmt_mc(r.get("market_cap", 0))
+    f["vol_fmt"]   = _fmt_mc(r.get("volume_24h", 0))
+    f["dev_short"] = f"<code>{_esc(_short(deployer) if len(deployer) > 12 else deployer)}</code>"
+    f["exp_url"]   = html.escape(get_explorer_url(deployer, chain))
+    return _EVM_REPORT_TMPL.format_map(f)
+
+
+def format_report(ca: str, r: dict) -> str:
+    f, dev = _report_fields(ca, r)
+    deployer = dev["deployer"]
+
+    f.setdefault("lp_locked", "Unknown")
+    f["dev_short"] = f"<code>{_esc(_short(deployer))}</code>" if deployer and deployer != "N/A" else "<code>N/A</code>"
+    return _REPORT_TMPL.format_map(f)
 
 
 @require_auth
 async def watch_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not context.args:
-        await update.message.reply_text("Usage: /watch <contract_address>")
+        await update.message.reply_text(_WATCH_USAGE)
         return
     ca = context.args[0].strip()
-    add_to_watchlist(str(update.effective_user.id), ca)
-    await update.message.reply_text(f"✅ Added `{ca[:8]}...{ca[-4:]}` to your watchlist.", parse_mode="Markdown")
+    add_to_watchlist(update.effective_user.id, ca)
+    await update.message.reply_text(f"✅ Added <code>{_esc(_short(ca))}</code> to your watchlist.", parse_mode=ParseMode.HTML)
 
 
 @require_auth
 async def unwatch_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not context.args:
-        await update.message.reply_text("Usage: /unwatch <contract_address>")
+        await update.message.reply_text(_UNWATCH_USAGE)
         return
-    removed = remove_from_watchlist(str(update.effective_user.id), context.args[0].strip())
+    removed = remove_from_watchlist(update.effective_user.id, context.args[0].strip())
     if removed:
-        await update.message.reply_text(f"🗑 Removed from watchlist.", parse_mode="Markdown")
+        await update.message.reply_text("🗑 Removed from watchlist.")
     else:
         await update.message.reply_text("That address wasn't in your watchlist.")
 
 
 @require_auth
 async def watchlist_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    wl = get_watchlist(str(update.effective_user.id))
+    wl = get_watchlist(update.effective_user.id)
     if not wl:
-        await update.message.reply_text("Your watchlist is empty. Use /watch <CA> to add tokens.")
+        await update.message.reply_text(_WATCHLIST_EMPTY_MSG)
         return
-    lines = ["👁 *Your Watchlist:*\n"] + [f"{i}. `{ca}`" for i, ca in enumerate(wl, 1)]
-    await update.message.reply_text("\n".join(lines), parse_mode="Markdown")
+    text = _WATCHLIST_HEADER + "\n".join(f"{i}. <code>{_esc(ca)}</code>" for i, ca in enumerate(wl, 1))
+    await update.message.reply_text(text, parse_mode=ParseMode.HTML)
+
+
+@one_scan_per_user_cb
+async def _cb_scan(query, context, ca):
+    await run_scan(query, context, ca)
+
+
+@one_scan_per_user_cb
+async def _cb_cluster(query, context, ca):
+    result = await find_wallet_clusters(ca)
+    report = format_cluster_report(result)
+    await _reply_paged(query.message, report, parse_mode=ParseMode.MARKDOWN, disable_web_page_preview=True)
+
+
+async def _cb_watch(query, context, ca):
+    add_to_watchlist(query.from_user.id, ca)
+    await query.edit_message_reply_markup(reply_markup=_watching_markup(ca))
+
+
+# callback_data is "<op>:<ca>"
+_CALLBACKS = {
+    "scan": _cb_scan,
+    "cluster": _cb_cluster,
+    "watch": _cb_watch,
+}
 
 
 async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
-    if query.data.startswith("scan:"):
-        ca = query.data.split("scan:")[1]
-        await query.answer()
-        await run_scan(query, context, ca)
-        return
-    if query.data.startswith("cluster:"):
-        ca = query.data.split("cluster:")[1]
-        await query.answer()
-        from clusters import find_wallet_clusters, format_cluster_report
-        result = await find_wallet_clusters(ca)
-        report = format_cluster_report(result)
-        await query.message.reply_text(report[:4000], parse_mode="Markdown", disable_web_page_preview=True)
-        return
-    if query.data.startswith("watch:"):
-        ca = query.data.split("watch:")[1]
-        add_to_watchlist(str(query.from_user.id), ca)
-        await query.edit_message_reply_markup(reply_markup=InlineKeyboardMarkup([[
-            InlineKeyboardButton("✅ Watching", callback_data="noop"),
-            InlineKeyboardButton("🔗 Pump.fun", url=f"https://pump.fun/coin/{ca}")
-        ]]))
+    op, _, ca = query.data.partition(":")
+    handler = _CALLBACKS.get(op)
+    if handler is not None:
+        await handler(query, context, ca)
 
 
 async def watchlist_job(context: ContextTypes.DEFAULT_TYPE):
     alerts = await check_watchlist_alerts()
+
+    # Users are served concurrently (bounded); each user's alerts go out in order
+    by_user = {}
     for user_id, ca, message in alerts:
-        try:
-            await context.bot.send_message(chat_id=user_id, text=f"🚨 *WATCHLIST ALERT*\n\n`{ca}`\n\n{message}", parse_mode="Markdown")
-        except Exception as e:
-            logger.error(f"Alert error: {e}")
+        by_user.setdefault(user_id, []).append((ca, message))
+    sem = asyncio.Semaphore(ALERT_SEND_CONCURRENCY)
+
+    async def _send_group(user_id, items):
+        async with sem:
+            for ca, message in items:
+                try:
+                    await context.bot.send_message(
+                        chat_id=user_id,
+                        text=f"🚨 <b>WATCHLIST ALERT</b>\n\n<code>{_esc(ca)}</code>\n\n{_esc(message)}",
+                        parse_mode=ParseMode.HTML,
+                    )
+                except Exception as e:
+                    logger.error("Alert error: %s", e)
+
+    await asyncio.gather(*(_send_group(uid, items) for uid, items in by_user.items()))
+
 
+async def flush_state_job(context: ContextTypes.DEFAULT_TYPE):
+    try:
+        await flush_watchlist()
+    except Exception as e:
+        logger.error("Watchlist flush error: %s", e)
+
+
+
+def _render_dev(ca: str, result: dict) -> tuple:
+    deployer = result.get("deployer", "Unknown")
+    token_lines = result.get("token_lines", [])
+    biggest_mc = result.get("biggest_mc", 0)
+
+    token_block = (
+        "━━━ 🪙 PREVIOUS TOKENS (top 5) ━━━\n" + "".join(f"{_esc(tl)}\n" for tl in token_lines) + "\n"
+        if token_lines else ""
+    )
+    text = _DEV_REPORT_TMPL.format(
+        deployer=html.escape(deployer),
+        deployer_short=_esc(_short(deployer)),
+        token_count=result.get("token_count", 0),
+        dead_count=result.get("dead_count", 0),
+        biggest_mc=_fmt_mc(biggest_mc) if biggest_mc else "N/A",
+        risk=_esc(result.get("risk", "N/A")),
+        risk_note=_esc(result.get("risk_note", "")),
+        token_block=token_block,
+        summary=_esc(result.get("summary", "")),
+    )
+    return text, _dev_markup(ca, deployer)
 
 
 @require_auth
+@one_scan_per_user
 async def dev_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not context.args:
-        await update.message.reply_text(
-            "Usage: /dev <contract_address>\n\nExample: /dev 8JnBeGkvs1XGLquaLcrZ9i4UCPjiDa2fSR1uv6k8pump"
-        )
+        await update.message.reply_text(_DEV_USAGE)
         return
     ca = context.args[0].strip()
+
+    cached = get_dev_alpha.cache.get((ca,))
+    if cached:
+        text, markup = _render_dev(ca, cached)
+        await update.message.reply_text(text, parse_mode=ParseMode.HTML,
+            reply_markup=markup, disable_web_page_preview=True)
+        return
+
     msg = await update.message.reply_text(
-        f"🔎 Analysing dev history for `{ca[:8]}...{ca[-4:]}`\nThis takes ~15 seconds...",
-        parse_mode="Markdown"
+        f"🔎 Analysing dev history for <code>{_esc(_short(ca))}</code>\nThis takes ~15 seconds...",
+        parse_mode=ParseMode.HTML
     )
     try:
         result = await get_dev_alpha(ca)
 
         if result.get("error"):
-            await msg.edit_text(f"❌ {result['error']}", parse_mode="Markdown")
+            get_dev_alpha.cache.pop((ca,))  # don't pin transient failures
+            await msg.edit_text(f"❌ {_esc(result['error'])}", parse_mode=ParseMode.HTML)
             return
 
-        deployer = result.get("deployer", "Unknown")
-        token_count = result.get("token_count", 0)
-        risk = result.get("risk", "N/A")
-        risk_note = result.get("risk_note", "")
-        summary = result.get("summary", "")
-        token_lines = result.get("token_lines", [])
-        dead_count = result.get("dead_count", 0)
-        biggest = result.get("biggest_launch")
-
-        def fmt_mc(mc):
-            if not mc: return "N/A"
-            if mc >= 1_000_000: return f"${mc/1_000_000:.2f}M"
-            elif mc >= 1_000: return f"${mc/1_000:.1f}K"
-            else: return f"${mc:.0f}"
-
-        lines = [
-            f"👨‍💻 *DEV ALPHA REPORT*",
-            f"",
-            f"*Deployer:* `{deployer[:8]}...{deployer[-4:]}`",
-            f"[View on Solscan](https://solscan.io/account/{deployer})",
-            f"",
-            f"━━━ 📊 LAUNCH HISTORY (60 days) ━━━",
-            f"• Total launches: `{token_count}`",
-            f"• Dead/untraded: `{dead_count}`",
-            f"• Biggest MC: `{fmt_mc(result.get('biggest_mc', 0))}`",
-            f"",
-            f"━━━ ⚠️ DEV RISK ━━━",
-            f"• Rating: {risk}",
-            f"• Note: _{risk_note}_",
-            f"",
-        ]
-
-        if token_lines:
-            lines.append("━━━ 🪙 PREVIOUS TOKENS (top 5) ━━━")
-            lines.extend(token_lines)
-            lines.append("")
-
-        lines.append("━━━ 🤖 SUMMARY ━━━")
-        lines.append(summary)
-        lines.append("")
-        lines.append("_Powered by Chain Sentinel • $CS_")
-
-        keyboard = [[
-            InlineKeyboardButton("🔍 Full Scan", callback_data=f"scan:{ca}"),
-            InlineKeyboardButton("👁 Solscan", url=f"https://solscan.io/account/{deployer}")
-        ]]
-
+        text, markup = _render_dev(ca, result)
         await msg.edit_text(
-            "\n".join(lines),
-            parse_mode="Markdown",
-            reply_markup=InlineKeyboardMarkup(keyboard),
+            text,
+            parse_mode=ParseMode.HTML,
+            reply_markup=markup,
             disable_web_page_preview=True
         )
 
     except Exception as e:
-        logger.error(f"Dev alpha error: {e}")
-        await msg.edit_text("❌ Dev analysis failed. Try again in a moment.", parse_mode="Markdown")
+        logger.error("Dev alpha error: %s", e)
+        await msg.edit_text("❌ Dev analysis failed. Try again in a moment.", parse_mode=ParseMode.HTML)
 
 
 @require_auth
+@one_scan_per_user
 async def smartmoney_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not context.args or len(context.args) < 2:
-        await update.message.reply_text(
-            "🧠 *Smart Money Finder*\n\n"
-            "Find wallets holding multiple successful tokens with high win rates.\n\n"
-            "Usage: `/smartmoney <CA1> <CA2> [CA3] [CA4] [CA5]`\n\n"
-            "Example: paste 2-5 contract addresses separated by spaces.\n"
-            "_Minimum 2 CAs required._",
-            parse_mode="Markdown"
-        )
+        await update.message.reply_text(_SMARTMONEY_USAGE, parse_mode=ParseMode.MARKDOWN)
         return
 
-    mints = [a.strip() for a in context.args if len(a.strip()) >= 32]
+    mints = [a for a in map(str.strip, context.args) if _B58(a)]
     if len(mints) < 2:
         await update.message.reply_text("❌ Please provide at least 2 valid Solana contract addresses.")
         return
@@ -531,7 +784,7 @@ async def smartmoney_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     msg = await update.message.reply_text(
         f"🧠 Scanning smart money across {len(mints)} tokens...\n"
         f"This takes 20-30 seconds...",
-        parse_mode="Markdown"
+        parse_mode=ParseMode.MARKDOWN
     )
 
     try:
@@ -539,6 +792,7 @@ async def smartmoney_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
         report = format_smart_money_report(result)
 
         # Auto-add qualified wallets to mirror tracker
+        uid = update.effective_user.id
         qualified = result.get("qualified_wallets", [])
         auto_added = []
         if qualified:
@@ -553,120 +807,71 @@ async def smartmoney_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     pnl  = w.get("total_pnl_sol", 0)
                     wr   = w.get("win_rate", 0)
                     label = f"SmartMoney {wallet_addr[:6]} | {wr*100:.0f}% WR"
-                    add_mirror_wallet(update.effective_user.id, wallet_addr, wallet_chain, label)
+                    add_mirror_wallet(uid, wallet_addr, wallet_chain, label)
                     auto_added.append(wallet_addr)
 
         if auto_added:
             report += f"\n\n✅ *Auto-added {len(auto_added)} wallet(s) to Mirror tracker.*"
-            if not get_budget(update.effective_user.id):
+            if not get_budget(uid):
                 report += "\n⚠️ Set your budget: `/mirror budget <amount>`"
 
-        # Telegram message limit is 4096 chars
-        if len(report) > 4000:
-            report = report[:3900] + "\n\n_Report truncated — too many results._"
-
-        await msg.edit_text(report, parse_mode="Markdown", disable_web_page_preview=True)
+        await _edit_paged(msg, report, parse_mode=ParseMode.MARKDOWN, disable_web_page_preview=True)
 
     except Exception as e:
-        logger.error(f"Smart money error: {e}")
-        await msg.edit_text("❌ Smart money scan failed. Try again with different tokens.", parse_mode="Markdown")
+        logger.error("Smart money error: %s", e)
+        await msg.edit_text("❌ Smart money scan failed. Try again with different tokens.", parse_mode=ParseMode.MARKDOWN)
 
 
 @require_auth
+@one_scan_per_user
 async def cluster_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not context.args:
-        await update.message.reply_text(
-            "🕸 *Wallet Cluster Detector*\n\n"
-            "Finds coordinated wallets funded by the same source (cabals).\n\n"
-            "Usage: `/cluster <contract_address>`",
-            parse_mode="Markdown"
-        )
+        await update.message.reply_text(_CLUSTER_USAGE, parse_mode=ParseMode.MARKDOWN)
         return
 
     ca = context.args[0].strip()
     msg = await update.message.reply_text(
-        f"🕸 Scanning wallet clusters for `{ca[:8]}...{ca[-4:]}`\n"
+        f"🕸 Scanning wallet clusters for `{_short(ca)}`\n"
         f"Tracing funding sources — takes ~20 seconds...",
-        parse_mode="Markdown"
+        parse_mode=ParseMode.MARKDOWN
     )
 
     try:
-        chain_type = detect_chain(ca)
-        if chain_type == "evm":
-            async with __import__("aiohttp").ClientSession() as session:
-                from evm_scanner import detect_evm_chain
-                chain = await detect_evm_chain(session, ca)
-            result = await get_evm_clusters(ca, chain)
-            chain_name = "Base" if chain == "base" else "Ethereum"
-            if result.get("error"):
-                report = f"❌ {result['error']}"
-            else:
-                score = result.get("cabal_probability", 0)
-                clusters = result.get("clusters", [])
-                lines = [
-                    f"🕸 *WALLET CLUSTER REPORT* — {chain_name}",
-                    f"`{ca}`", f"",
-                    f"*Cabal Probability: {score}/100*", f"",
-                    f"• Holders scanned: `{result.get('total_holders_scanned', 0)}`",
-                    f"• Clusters found: `{len(clusters)}`", f"",
-                ]
-                for i, c in enumerate(clusters[:5], 1):
-                    lines += [
-                        f"*Cluster #{i}* — Funder: `{c['funder'][:8]}...`",
-                        f"Funded {c['count']} wallets", f"",
-                    ]
-                report = "\n".join(lines)
-        else:
-            result = await find_wallet_clusters(ca)
-            report = format_cluster_report(result)
+        result = await find_wallet_clusters(ca)
+        report = format_cluster_report(result)
 
-        if len(report) > 4000:
-            report = report[:3900] + "\n\n_Report truncated._"
-        await msg.edit_text(report, parse_mode="Markdown", disable_web_page_preview=True)
+        await _edit_paged(msg, report, parse_mode=ParseMode.MARKDOWN, disable_web_page_preview=True)
 
     except Exception as e:
-        logger.error(f"Cluster error: {e}")
-        await msg.edit_text("❌ Cluster scan failed. Try again.", parse_mode="Markdown")
+        logger.error("Cluster error: %s", e)
+        await msg.edit_text("❌ Cluster scan failed. Try again.", parse_mode=ParseMode.MARKDOWN)
 
 
 @require_auth
 async def monitor_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_user.id
     if is_monitoring(user_id):
-        await update.message.reply_text(
-            "👁 You are already receiving live launch alerts.\n"
-            "Use /unmonitor to stop.",
-            parse_mode="Markdown"
-        )
+        await update.message.reply_text(_MONITOR_ALREADY_MSG, parse_mode=ParseMode.MARKDOWN)
         return
     add_monitor_user(user_id)
     add_evm_monitor_user(user_id)
-    await update.message.reply_text(
-        "✅ *Live Monitor ON*\n\n"
-        "You will now receive instant alerts for:\n"
-        "• 🟣 Solana — pump.fun new launches\n"
-        "• 🔵 Base — Uniswap new pairs\n"
-        "• ⟠ Ethereum — Uniswap new pairs\n\n"
-        "Filter: must have socials + optional bullish dev\n\n"
-        "Use /unmonitor to stop alerts.",
-        parse_mode="Markdown"
-    )
+    await update.message.reply_text(_MONITOR_ON_MSG, parse_mode=ParseMode.MARKDOWN)
 
 @require_auth
 async def unmonitor_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_user.id
     remove_monitor_user(user_id)
     remove_evm_monitor_user(user_id)
-    await update.message.reply_text("🔕 Live monitor disabled for all chains. Use /monitor to re-enable.")
+    await update.message.reply_text(_MONITOR_OFF_MSG)
 
 async def monitorstatus_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if update.effective_user.id != ADMIN_ID:
-        await update.message.reply_text("⛔ Admin only.")
+        await update.message.reply_text(_ADMIN_ONLY_MSG)
         return
     count = get_monitor_count()
     await update.message.reply_text(
         f"📡 *Monitor Status*\n\nActive listeners: `{count}`",
-        parse_mode="Markdown"
+        parse_mode=ParseMode.MARKDOWN
     )
 
 
@@ -679,7 +884,7 @@ async def mirror_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not args:
         await update.message.reply_text(
             format_mirror_list(user_id),
-            parse_mode="Markdown",
+            parse_mode=ParseMode.MARKDOWN,
             disable_web_page_preview=True
         )
         return
@@ -693,7 +898,7 @@ async def mirror_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await update.message.reply_text(
                 f"💰 Your current mirror budget: `${budget:,.2f}`\n\n"
                 f"To change: `/mirror budget 500`",
-                parse_mode="Markdown"
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         try:
@@ -702,10 +907,10 @@ async def mirror_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await update.message.reply_text(
                 f"✅ Mirror budget set to `${amount:,.2f}`\n\n"
                 f"When a tracked whale buys, I\'ll calculate how much you should put in to match their conviction.",
-                parse_mode="Markdown"
+                parse_mode=ParseMode.MARKDOWN
             )
         except ValueError:
-            await update.message.reply_text("❌ Invalid amount. Example: `/mirror budget 500`", parse_mode="Markdown")
+            await update.message.reply_text("❌ Invalid amount. Example: `/mirror budget 500`", parse_mode=ParseMode.MARKDOWN)
         return
 
     # /mirror add <wallet> [label]
@@ -714,42 +919,42 @@ async def mirror_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await update.message.reply_text(
                 "Usage: `/mirror add <wallet_address> [label]`\n\n"
                 "Or run `/smartmoney <CA1> <CA2>` to auto-find and add smart money wallets.",
-                parse_mode="Markdown"
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         wallet = args[1].strip()
         label  = " ".join(args[2:]) if len(args) > 2 else ""
         chain  = await detect_chain(wallet)
         if chain == "unknown":
-            await update.message.reply_text("❌ Could not detect chain for this wallet address.", parse_mode="Markdown")
+            await update.message.reply_text("❌ Could not detect chain for this wallet address.", parse_mode=ParseMode.MARKDOWN)
             return
         add_mirror_wallet(user_id, wallet, chain, label)
         cemoji = chain_emoji(chain)
         await update.message.reply_text(
-            f"✅ Now mirroring {cemoji} `{wallet[:8]}...{wallet[-4:]}`\n"
+            f"✅ Now mirroring {cemoji} `{_short(wallet)}`\n"
             f"Chain: *{chain_name(chain)}*\n"
             f"Label: _{label or 'No label'}_\n\n"
             f"{'⚠️ Set your budget first: `/mirror budget <amount>`' if not get_budget(user_id) else f'Budget: `${get_budget(user_id):,.2f}`'}",
-            parse_mode="Markdown"
+            parse_mode=ParseMode.MARKDOWN
         )
         return
 
     # /mirror remove <wallet>
     if sub in ("remove", "rm", "delete"):
         if len(args) < 2:
-            await update.message.reply_text("Usage: `/mirror remove <wallet_address>`", parse_mode="Markdown")
+            await update.message.reply_text("Usage: `/mirror remove <wallet_address>`", parse_mode=ParseMode.MARKDOWN)
             return
         wallet = args[1].strip()
         removed = remove_mirror_wallet(user_id, wallet)
         if removed:
-            await update.message.reply_text(f"✅ Removed `{wallet[:8]}...{wallet[-4:]}` from mirror list.", parse_mode="Markdown")
+            await update.message.reply_text(f"✅ Removed `{_short(wallet)}` from mirror list.", parse_mode=ParseMode.MARKDOWN)
         else:
-            await update.message.reply_text("❌ Wallet not found in your mirror list.", parse_mode="Markdown")
+            await update.message.reply_text("❌ Wallet not found in your mirror list.", parse_mode=ParseMode.MARKDOWN)
         return
 
     # /mirror list
     if sub == "list":
-        await update.message.reply_text(format_mirror_list(user_id), parse_mode="Markdown", disable_web_page_preview=True)
+        await update.message.reply_text(format_mirror_list(user_id), parse_mode=ParseMode.MARKDOWN, disable_web_page_preview=True)
         return
 
     await update.message.reply_text(
@@ -759,7 +964,7 @@ async def mirror_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "`/mirror add <wallet>` — track a wallet\n"
         "`/mirror remove <wallet>` — stop tracking\n\n"
         "_Wallets are auto-added from `/smartmoney` results._",
-        parse_mode="Markdown"
+        parse_mode=ParseMode.MARKDOWN
     )
 
 
@@ -774,11 +979,6 @@ async def snipe_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
         filters = get_filters(user_id)
         status  = "🟢 *ON*" if active else "🔴 *OFF*"
 
-        def fmt_mc(mc):
-            if mc >= 1_000_000: return f"${mc/1_000_000:.1f}M"
-            if mc >= 1_000:     return f"${mc/1_000:.0f}K"
-            return f"${mc:.0f}"
-
         chains_on = ", ".join(filters.get("chains", ["solana", "base"]))
         lines = [
             f"🎯 *Runner Sniper* — {status}",
@@ -786,7 +986,7 @@ async def snipe_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"*Active filters:*",
             f"• Min LP: `${filters.get('min_lp_usd', 1000):,.0f}`",
             f"• Max top-10 supply: `{filters.get('max_top10_pct', 60)}%`",
-            f"• Min dev MC: `{fmt_mc(filters.get('min_dev_mc', 50000))}`",
+            f"• Min dev MC: `{_fmt_mc(filters.get('min_dev_mc', 50000))}`",
             f"• Max cabal %: `{filters.get('max_cabal_pct', 30)}%`",
             f"• Require smart money: `{'Yes' if filters.get('require_smart_money') else 'No'}`",
             f"• Chains: `{chains_on}`",
@@ -801,7 +1001,7 @@ async def snipe_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"`/snipe set smartmoney on/off`",
             f"`/snipe set chains sol/base/both`",
         ]
-        await update.message.reply_text("\n".join(lines), parse_mode="Markdown")
+        await update.message.reply_text("\n".join(lines), parse_mode=ParseMode.MARKDOWN)
         return
 
     sub = args[0].lower()
@@ -819,7 +1019,7 @@ async def snipe_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"• Dev prev best ≥ `${filters.get('min_dev_mc',50000):,.0f}` MC\n"
             f"• Cabal % ≤ `{filters.get('max_cabal_pct',30)}%`\n\n"
             f"Use `/snipe off` to stop.",
-            parse_mode="Markdown"
+            parse_mode=ParseMode.MARKDOWN
         )
         return
 
@@ -844,14 +1044,14 @@ async def snipe_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
             try:
                 val = typ(value.replace("$","").replace("%","").replace(",",""))
                 update_filter(user_id, db_key, val)
-                await update.message.reply_text(f"✅ `{key}` set to `{val}`", parse_mode="Markdown")
+                await update.message.reply_text(f"✅ `{key}` set to `{val}`", parse_mode=ParseMode.MARKDOWN)
             except ValueError:
-                await update.message.reply_text(f"❌ Invalid value for `{key}`", parse_mode="Markdown")
+                await update.message.reply_text(f"❌ Invalid value for `{key}`", parse_mode=ParseMode.MARKDOWN)
 
         elif key == "smartmoney":
             val = value in ("on", "true", "yes", "1")
             update_filter(user_id, "require_smart_money", val)
-            await update.message.reply_text(f"✅ Smart money requirement: `{'ON' if val else 'OFF'}`", parse_mode="Markdown")
+            await update.message.reply_text(f"✅ Smart money requirement: `{'ON' if val else 'OFF'}`", parse_mode=ParseMode.MARKDOWN)
 
         elif key == "chains":
             if value == "sol":
@@ -865,47 +1065,78 @@ async def snipe_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
             else:
                 chains = ["solana", "base"]
             update_filter(user_id, "chains", chains)
-            await update.message.reply_text(f"✅ Monitoring: `{', '.join(chains)}`", parse_mode="Markdown")
+            await update.message.reply_text(f"✅ Monitoring: `{', '.join(chains)}`", parse_mode=ParseMode.MARKDOWN)
         else:
             await update.message.reply_text(
                 "Unknown setting. Options: `minlp`, `maxsupply`, `mindev`, `maxcabal`, `smartmoney`, `chains`",
-                parse_mode="Markdown"
+                parse_mode=ParseMode.MARKDOWN
             )
         return
 
     await update.message.reply_text(
         "Usage: `/snipe on` | `/snipe off` | `/snipe set <key> <value>`",
-        parse_mode="Markdown"
+        parse_mode=ParseMode.MARKDOWN
     )
 
 
 def main():
-    app = Application.builder().token(TELEGRAM_TOKEN).build()
-    app.add_handler(CommandHandler("start", start))
-    app.add_handler(CommandHandler("help", help_cmd))
-    app.add_handler(CommandHandler("scan", scan_cmd))
-    app.add_handler(CommandHandler("watch", watch_cmd))
-    app.add_handler(CommandHandler("unwatch", unwatch_cmd))
-    app.add_handler(CommandHandler("watchlist", watchlist_cmd))
-    app.add_handler(CommandHandler("dev", dev_cmd))
-    app.add_handler(CommandHandler("smartmoney", smartmoney_cmd))
-    app.add_handler(CommandHandler("cluster", cluster_cmd))
-    app.add_handler(CommandHandler("monitor", monitor_cmd))
-    app.add_handler(CommandHandler("mirror", mirror_cmd))
-    app.add_handler(CommandHandler("snipe", snipe_cmd))
-    app.add_handler(CommandHandler("unmonitor", unmonitor_cmd))
-    app.add_handler(CommandHandler("monitorstatus", monitorstatus_cmd))
-    app.add_handler(CommandHandler("genlink", genlink_cmd))
-    app.add_handler(CommandHandler("invites", invites_cmd))
-    app.add_handler(CommandHandler("adduser", adduser_cmd))
-    app.add_handler(CallbackQueryHandler(button_callback))
-    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, message_handler))
+    # libuv-backed loop for the network-bound workload; must be set before
+    # PTB creates its loop in run_polling/run_webhook
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+    # Handlers run as independent tasks so one slow scan doesn't block other
+    # chats; the rate limiter keeps the resulting fan-out under Telegram's caps.
+    # Bot API calls go over HTTP/2 so alert fan-outs multiplex on one connection
+    # instead of queueing for a slot in the default single-connection pool.
+    # getUpdates keeps its own client: a 30s long poll parked on the shared
+    # pool would hold a slot the senders need.
+    app = (
+        Application.builder()
+        .token(TELEGRAM_TOKEN)
+        .request(HTTPXRequest(
+            http_version="2",
+            connection_pool_size=TG_POOL_SIZE,
+            pool_timeout=10.0,
+            connect_timeout=5.0,
+            read_timeout=15.0,   # Telegram answers slowly under bursts; avoid spurious TimedOut
+        ))
+        .get_updates_request(HTTPXRequest(http_version="2", connection_pool_size=1, connect_timeout=5.0))
+        .concurrent_updates(True)
+        .rate_limiter(AIORateLimiter(
+            overall_max_rate=30, overall_time_period=1,   # Bot API global cap
+            group_max_rate=20, group_time_period=60,      # per-group cap
+            max_retries=3,                                # honour RetryAfter instead of failing
+        ))
+        .build()
+    )
+    app.add_handler(CommandHandler("start", start, block=False))
+    app.add_handler(CommandHandler("help", help_cmd, block=False))
+    app.add_handler(CommandHandler("scan", scan_cmd, block=False))
+    app.add_handler(CommandHandler("watch", watch_cmd, block=False))
+    app.add_handler(CommandHandler("unwatch", unwatch_cmd, block=False))
+    app.add_handler(CommandHandler("watchlist", watchlist_cmd, block=False))
+    app.add_handler(CommandHandler("dev", dev_cmd, block=False))
+    app.add_handler(CommandHandler("smartmoney", smartmoney_cmd, block=False))
+    app.add_handler(CommandHandler("cluster", cluster_cmd, block=False))
+    app.add_handler(CommandHandler("monitor", monitor_cmd, block=False))
+    app.add_handler(CommandHandler("mirror", mirror_cmd, block=False))
+    app.add_handler(CommandHandler("snipe", snipe_cmd, block=False))
+    app.add_handler(CommandHandler("unmonitor", unmonitor_cmd, block=False))
+    app.add_handler(CommandHandler("monitorstatus", monitorstatus_cmd, block=False))
+    app.add_handler(CommandHandler("genlink", genlink_cmd, block=False))
+    app.add_handler(CommandHandler("invites", invites_cmd, block=False))
+    app.add_handler(CommandHandler("adduser", adduser_cmd, block=False))
+    app.add_handler(CallbackQueryHandler(button_callback, block=False))
+    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, message_handler, block=False))
     app.job_queue.run_repeating(watchlist_job, interval=1800, first=60)
+    app.job_queue.run_repeating(flush_state_job, interval=30, first=30)
     logger.info("Chain Sentinel bot is running...")
 
     # Start pump.fun monitor as background task
     async def post_init(application):
         bot = application.bot
+        await get_http_session()
         loop = asyncio.get_event_loop()
         loop.create_task(run_monitor(bot))
         loop.create_task(run_evm_monitor(bot))
@@ -913,8 +1144,26 @@ def main():
         loop.create_task(run_sniper_poller(bot))
         logger.info("[MONITOR] Solana + ETH + Base monitors + Mirror + Sniper started.")
 
+    async def post_shutdown(application):
+        await flush_watchlist()
+        await close_http_session()
+        close_chain_db()
+
     app.post_init = post_init
-    app.run_polling(allowed_updates=["message", "callback_query"])
+    app.post_shutdown = post_shutdown
+    allowed_updates = ["message", "callback_query"]
+    if WEBHOOK_URL:
+        app.run_webhook(
+            listen="0.0.0.0",
+            port=WEBHOOK_PORT,
+            url_path=TELEGRAM_TOKEN,
+            webhook_url=f"{WEBHOOK_URL}/{TELEGRAM_TOKEN}",
+            secret_token=WEBHOOK_SECRET,
+            allowed_updates=allowed_updates,
+        )
+    else:
+        # Long-poll for 30s per request instead of reconnecting every few seconds
+        app.run_polling(poll_interval=0.5, timeout=30, allowed_updates=allowed_updates)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,111 @@
+"""
+cache.py — In-process TTL caches for Chain Sentinel.
+Memoizes coroutine results with per-entry expiry; concurrent misses for the
+same key share one upstream call instead of stampeding the RPC/API.
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into a single awaited call."""
+
+    def __init__(self):
+        self._inflight = {}
+
+    async def do(self, key, loader):
+        while (fut := self._inflight.get(key)) is not None:
+            try:
+                # shield: a cancelled follower must not cancel the shared result
+                return await asyncio.shield(fut)
+            except asyncio.CancelledError:
+                # Only the leader was cancelled — retry (and likely lead) instead
+                if not fut.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved — there may be no followers
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+
+class TTLCache:
+    """Bounded LRU map whose entries expire `ttl` seconds after insertion."""
+
+    def __init__(self, ttl: float, maxsize: int = 4096):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._flight = SingleFlight()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    async def get_or_load(self, key, loader):
+        """Return the cached value for `key`, or await `loader()` once and cache it."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        async def load():
+            value = await loader()
+            self.set(key, value)
+            return value
+
+        return await self._flight.do(key, load)
+
+
+def ttl_cache(ttl: float, maxsize: int = 4096):
+    """Decorator — memoize a coroutine function on its positional arguments."""
+    def decorator(fn):
+        cache = TTLCache(ttl, maxsize)
+
+        @functools.wraps(fn)
+        async def wrapper(*args):
+            return await cache.get_or_load(args, lambda: fn(*args))
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
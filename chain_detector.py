@@ -5,23 +5,84 @@ chain_detector.py — Auto-detect which blockchain a contract address belongs to
 import re
 import aiohttp
 import asyncio
+import logging
 import os
+import sqlite3
+import threading
+from functools import lru_cache
+
+from http_client import get_http_session
+from cache import SingleFlight, TTLCache
+
+logger = logging.getLogger(__name__)
 
 HELIUS_RPC   = f"https://mainnet.helius-rpc.com/?api-key={os.environ.get('HELIUS_API_KEY','')}"
 ETHERSCAN_KEY = os.environ.get("ETHERSCAN_API_KEY", "")
 BASESCAN_KEY  = os.environ.get("BASESCAN_API_KEY", "")
+# getabi URL prefixes (address appended per call); None without a key.
+# getabi answers "is this a verified contract" without shipping the source.
+_EXPLORER_API = {
+    "base":     BASESCAN_KEY and f"https://api.basescan.org/api?module=contract&action=getabi&apikey={BASESCAN_KEY}&address=",
+    "ethereum": ETHERSCAN_KEY and f"https://api.etherscan.io/api?module=contract&action=getabi&apikey={ETHERSCAN_KEY}&address=",
+}
+# Free-tier explorer keys allow ~5 req/s; cap in-flight calls per host so a
+# burst queues here instead of tripping 429s and retry storms
+EXPLORER_CONCURRENCY = int(os.environ.get("EXPLORER_CONCURRENCY", "5"))
+_explorer_sems = {chain: asyncio.Semaphore(EXPLORER_CONCURRENCY) for chain in _EXPLORER_API}
+RPC_HTTP = {
+    "base":     os.environ.get("RPC_HTTP_BASE", "https://rpc.ankr.com/base"),
+    "ethereum": os.environ.get("RPC_HTTP_ETH",  "https://rpc.ankr.com/eth"),
+}
 
 # EVM address: 0x + 40 hex chars
 EVM_PATTERN  = re.compile(r'^0x[0-9a-fA-F]{40}$')
 # Solana address: base58, 32-44 chars
 SOL_PATTERN  = re.compile(r'^[1-9A-HJ-NP-Za-km-z]{32,44}$')
 
+# Fail fast on a stalled connect/read instead of spending the whole budget
+_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=2, sock_read=3)
+
+# Checked concurrently; when a contract exists on several, the earlier one wins
+EVM_CHAINS = ("base", "ethereum")
+
+# A contract's chain never changes, so confirmed EVM results never expire and
+# are only dropped by LRU eviction. The unconfirmed "base" fallback is only
+# remembered briefly — enough to stop a repeated bad CA re-hitting the
+# explorers, short enough that a newly verified contract is picked up.
+CHAIN_CACHE_SIZE = 50_000
+UNCONFIRMED_TTL = 60
+_chain_cache = TTLCache(float("inf"), maxsize=CHAIN_CACHE_SIZE)
+_unconfirmed_cache = TTLCache(UNCONFIRMED_TTL, maxsize=10_000)
+# Confirmed chains also persist on disk so a restart doesn't re-probe every
+# token the bot has already seen; the in-memory LRU sits in front of it.
+CHAIN_DB_FILE = "chain_cache.db"
+_db = None
+_db_lock = threading.Lock()
+_db_error_logged = False
+
+# Concurrent lookups of the same CA (a viral token pasted by many users at
+# once) share one set of probes
+_inflight = SingleFlight()
+
+# Bodies only: length and prefix are checked in plain Python first, so the
+# regex just scans the alphabet with no anchors or bounded repeats
+_hex_body = re.compile(r'[0-9a-fA-F]+').fullmatch
+_b58_body = re.compile(r'[1-9A-HJ-NP-Za-km-z]+').fullmatch
+
 
 def is_evm_address(ca: str) -> bool:
-    return bool(EVM_PATTERN.match(ca))
+    return len(ca) == 42 and ca.startswith("0x") and _hex_body(ca, 2) is not None
 
 def is_solana_address(ca: str) -> bool:
-    return bool(SOL_PATTERN.match(ca)) and not ca.startswith("0x")
+    return 32 <= len(ca) <= 44 and _b58_body(ca) is not None
+
+
+def cached_chain(ca: str):
+    """Chain for `ca` if it is known without a network call, else None."""
+    if is_solana_address(ca):
+        return "solana"
+    key = ca.lower()
+    return _chain_cache.get(key) or _unconfirmed_cache.get(key)
 
 
 async def detect_chain(ca: str) -> str:
@@ -29,58 +90,166 @@ async def detect_chain(ca: str) -> str:
     Returns: 'solana', 'base', 'ethereum', or 'unknown'
     For EVM addresses, checks Base first (faster/cheaper), then Ethereum.
     """
+    # The two formats are disjoint — "0x" can't occur in base58, which has no
+    # "0" — so classification alone settles Solana vs EVM with no RPC probe.
     if is_solana_address(ca):
         return "solana"
 
     if not is_evm_address(ca):
         return "unknown"
 
-    # Check Base and Ethereum in parallel
-    async with aiohttp.ClientSession() as session:
-        base_task = asyncio.create_task(_check_evm_chain(session, ca, "base"))
-        eth_task  = asyncio.create_task(_check_evm_chain(session, ca, "ethereum"))
-        base_found, eth_found = await asyncio.gather(base_task, eth_task)
+    key = ca.lower()
+    chain = _chain_cache.get(key) or _unconfirmed_cache.get(key)
+    if chain is not None:
+        return chain
+    return await _inflight.do(key, lambda: _detect_evm(ca, key))
+
 
-    if base_found:
-        return "base"
-    if eth_found:
-        return "ethereum"
-    # Default for EVM if we can't confirm — try Base first as it's likely
-    return "base"
+def _db_conn() -> sqlite3.Connection:
+    global _db
+    if _db is None:
+        _db = sqlite3.connect(CHAIN_DB_FILE, isolation_level=None, check_same_thread=False)
+        _db.execute("PRAGMA journal_mode=WAL")
+        _db.execute("CREATE TABLE IF NOT EXISTS chains (ca TEXT PRIMARY KEY, chain TEXT NOT NULL)")
+    return _db
+
+
+def _db_error(e: sqlite3.Error):
+    # Logged once: a corrupt or locked file would otherwise fail on every lookup
+    global _db_error_logged
+    if not _db_error_logged:
+        _db_error_logged = True
+        logger.warning(f"[CHAIN] sqlite cache error, falling back to probes: {e}")
+
+
+def close_chain_db():
+    """Close the on-disk chain cache (bot shutdown)."""
+    global _db
+    with _db_lock:
+        if _db is not None:
+            _db.close()
+            _db = None
+
+
+def _db_get(key: str):
+    try:
+        with _db_lock:
+            row = _db_conn().execute("SELECT chain FROM chains WHERE ca = ?", (key,)).fetchone()
+    except sqlite3.Error as e:
+        _db_error(e)
+        return None
+    return row[0] if row else None
+
+
+def _db_put(key: str, chain: str):
+    try:
+        with _db_lock:
+            _db_conn().execute("INSERT OR REPLACE INTO chains (ca, chain) VALUES (?, ?)", (key, chain))
+    except sqlite3.Error as e:
+        _db_error(e)  # the cache is an optimisation; detection already succeeded
+
+
+async def _detect_evm(ca: str, key: str) -> str:
+    chain = await asyncio.to_thread(_db_get, key)
+    if chain is None:
+        chain = await _probe_evm(ca)
+        if chain is None:
+            # Default for EVM if we can't confirm — try Base first as it's likely
+            _unconfirmed_cache.set(key, "base")
+            return "base"
+        await asyncio.to_thread(_db_put, key, chain)
+    _chain_cache.set(key, chain)
+    return chain
+
+
+async def _probe_evm(ca: str):
+    """Return the confirmed chain for an EVM address, or None."""
+    # Check all chains in parallel and answer as soon as the most preferred
+    # chain that can still win has confirmed; the remaining checks are cancelled.
+    session = await get_http_session()
+    tasks = {asyncio.create_task(_check_evm_chain(session, ca, c)): c for c in EVM_CHAINS}
+    found = {}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                found[tasks[task]] = task.result()
+            for c in EVM_CHAINS:
+                if c not in found:
+                    break  # a preferred chain hasn't answered yet
+                if found[c]:
+                    return c
+    finally:
+        for task in pending:
+            task.cancel()
+    return None
 
 
 async def _check_evm_chain(session: aiohttp.ClientSession, ca: str, chain: str) -> bool:
     """Check if a contract exists on the given chain."""
+    has_code = await _has_code(session, ca, chain)
+    if has_code is not None:
+        return has_code
+    # RPC unavailable — fall back to the explorer API
+    return await _check_explorer(session, ca, chain)
+
+
+async def _has_code(session: aiohttp.ClientSession, ca: str, chain: str):
+    """eth_getCode probe — a few bytes instead of the explorer's source bundle.
+    Returns None if the RPC couldn't answer."""
+    payload = {"jsonrpc": "2.0", "id": 1, "method": "eth_getCode", "params": [ca, "latest"]}
+    try:
+        async with session.post(RPC_HTTP[chain], json=payload, timeout=_TIMEOUT) as resp:
+            data = await resp.json(content_type=None)
+        code = data.get("result")
+        if isinstance(code, str):
+            return len(code) > 2  # "0x" — no contract deployed at this address
+    except Exception:
+        pass
+    return None
+
+
+async def _check_explorer(session: aiohttp.ClientSession, ca: str, chain: str) -> bool:
+    prefix = _EXPLORER_API.get(chain)
+    if not prefix:
+        return False  # no API key — the explorer would just reject the call
     try:
-        if chain == "base":
-            url = f"https://api.basescan.org/api?module=contract&action=getsourcecode&address={ca}&apikey={BASESCAN_KEY}"
-        else:
-            url = f"https://api.etherscan.io/api?module=contract&action=getsourcecode&address={ca}&apikey={ETHERSCAN_KEY}"
-
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-            data = await resp.json()
-            result = data.get("result", [])
-            if isinstance(result, list) and result:
-                return bool(result[0].get("ContractName") or result[0].get("ABI"))
+        async with _explorer_sems[chain]:
+            async with session.get(prefix + ca, timeout=_TIMEOUT) as resp:
+                data = await resp.json(content_type=None)
+        # status "1" with the ABI as result; "0" for unverified or unknown addresses
+        return data.get("status") == "1"
     except Exception:
         pass
     return False
 
 
+_CHAIN_EMOJI = {"solana": "◎", "base": "🔵", "ethereum": "⟠"}
+_CHAIN_NAME  = {"solana": "Solana", "base": "Base", "ethereum": "Ethereum"}
+# chain -> (explorer, dex) URL templates
+_URL_TPLS = {
+    "solana":   ("https://solscan.io/token/{}",   "https://pump.fun/coin/{}"),
+    "base":     ("https://basescan.org/token/{}", "https://app.uniswap.org/#/swap?outputCurrency={}&chain=base"),
+    "ethereum": ("https://etherscan.io/token/{}", "https://app.uniswap.org/#/swap?outputCurrency={}"),
+}
+_NO_URLS = ("", "")
+
+
 def chain_emoji(chain: str) -> str:
-    return {"solana": "◎", "base": "🔵", "ethereum": "⟠"}.get(chain, "🔗")
+    return _CHAIN_EMOJI.get(chain, "🔗")
 
 def chain_name(chain: str) -> str:
-    return {"solana": "Solana", "base": "Base", "ethereum": "Ethereum"}.get(chain, chain.title())
+    return _CHAIN_NAME.get(chain) or chain.title()
+
+@lru_cache(maxsize=4096)
+def urls_for(ca: str, chain: str) -> tuple:
+    """(explorer_url, dex_url) for a token — one lookup when a card needs both."""
+    explorer, dex = _URL_TPLS.get(chain, _NO_URLS)
+    return explorer.format(ca), dex.format(ca)
 
 def get_explorer_url(ca: str, chain: str) -> str:
-    if chain == "solana":   return f"https://solscan.io/token/{ca}"
-    if chain == "base":     return f"https://basescan.org/token/{ca}"
-    if chain == "ethereum": return f"https://etherscan.io/token/{ca}"
-    return ""
+    return urls_for(ca, chain)[0]
 
 def get_dex_url(ca: str, chain: str) -> str:
-    if chain == "solana":   return f"https://pump.fun/coin/{ca}"
-    if chain == "base":     return f"https://app.uniswap.org/#/swap?outputCurrency={ca}&chain=base"
-    if chain == "ethereum": return f"https://app.uniswap.org/#/swap?outputCurrency={ca}"
-    return ""
+    return urls_for(ca, chain)[1]
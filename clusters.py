@@ -8,8 +8,13 @@ import os
 import asyncio
 import aiohttp
 import logging
-import json
-from collections import defaultdict
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import groupby
+from operator import itemgetter
+
+from http_client import get_http_session, close_http_session, dumps_pretty
+from cache import TTLCache
 
 try:
     import networkx as nx
@@ -24,7 +29,7 @@ HELIUS_RPC     = f"https://mainnet.helius-rpc.com/?api-key={HELIUS_API_KEY}"
 HELIUS_API     = "https://api.helius.xyz/v0"
 
 SYSTEM_PROGRAM  = "11111111111111111111111111111111"
-EXCLUDED_FUNDRS = {
+EXCLUDED_FUNDRS = frozenset({
     "11111111111111111111111111111111",
     "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",
     "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJe1bfE",
@@ -32,7 +37,19 @@ EXCLUDED_FUNDRS = {
     "ComputeBudget111111111111111111111111111111",
     "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P",  # pump.fun
     "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8", # Raydium
-}
+})
+# Holders that are never part of a cabal — their funder isn't looked up at
+# all. Programs above plus exchange hot wallets (Binance, Coinbase, Kraken,
+# OKX, Bybit), which show up among the top holders of most listed tokens.
+KNOWN_NONCABAL_OWNERS = EXCLUDED_FUNDRS | frozenset({
+    "5tzFkiKscXHK5ZXCGbXZxdw7gTjjD1mBwuoFbhUvuAi9",
+    "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM",
+    "H8sMJSCQxfKiFTCfDR3DUMLPwcRbM61LGFJ8N4dK3WjS",
+    "2AQdpHJ2JpcEgPiATUXjQxA8QmafFegfQwSLWSprPicm",
+    "FWznbcNXWQuHTawe9RxvQ2LdCENssh12dsznf4RiouN5",
+    "5VCwKtCXgCJ6kit5FybXjvriW3xELsFDhYrPSqtJNmcD",
+    "AC5RDfQFmDS1deWZos921JfqscXdByf8BKHs5ACWjtW2",
+})
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -44,104 +61,150 @@ async def find_wallet_clusters(mint_address: str) -> dict:
     Full cabal cluster detection for a token mint.
     Returns clusters, cabal probability score, and networkx graph data.
     """
-    async with aiohttp.ClientSession() as session:
-
-        # Step 1: Get top 20 holders
-        logger.info(f"[CLUSTER] Fetching top holders for {mint_address[:8]}...")
-        holders = await get_top_holders(session, mint_address)
-        logger.info(f"[CLUSTER] Got {len(holders)} holders")
-
-        if not holders:
-            return {"error": "Could not fetch holders for this token."}
-
-        # Step 2: Find funding wallet for each holder (in parallel)
-        logger.info(f"[CLUSTER] Finding funding wallets...")
-        funding_tasks = [get_funding_wallet(session, h["owner"]) for h in holders]
-        funding_results = await asyncio.gather(*funding_tasks)
-
-        # Step 3: Build holder → funder map
-        holder_funder_map = {}
-        for holder, funder in zip(holders, funding_results):
-            owner = holder["owner"]
-            if funder and funder not in EXCLUDED_FUNDRS:
-                holder_funder_map[owner] = {
-                    "funder": funder,
-                    "balance_pct": holder.get("pct", 0),
-                    "ui_amount": holder.get("ui_amount", 0),
-                }
-
-        logger.info(f"[CLUSTER] Mapped {len(holder_funder_map)} holders to funders")
-
-        # Step 4: Group by funder — find cabals
-        funder_to_holders = defaultdict(list)
-        for holder, data in holder_funder_map.items():
-            funder_to_holders[data["funder"]].append({
-                "wallet": holder,
-                "balance_pct": data["balance_pct"],
-                "ui_amount": data["ui_amount"],
-            })
+    session = await get_http_session()
+
+    # Step 1: Get top 20 holders
+    logger.info(f"[CLUSTER] Fetching top holders for {mint_address[:8]}...")
+    holders = await get_top_holders(session, mint_address)
+    logger.info(f"[CLUSTER] Got {len(holders)} holders")
+
+    if not holders:
+        return {"error": "Could not fetch holders for this token."}
+
+    # Step 2: Find funding wallet for each holder (in parallel), skipping
+    # owners already known not to be cabal wallets
+    logger.info(f"[CLUSTER] Finding funding wallets...")
+    to_probe = [h.owner for h in holders if h.owner not in KNOWN_NONCABAL_OWNERS]
+    probed = dict(zip(to_probe, await get_funding_wallets(session, to_probe)))
+    funding_results = [probed.get(h.owner) for h in holders]
+
+    # Step 3: Build holder → funder map
+    holder_funder_map = {}
+    for holder, funder in zip(holders, funding_results):
+        if funder and funder not in EXCLUDED_FUNDRS:
+            holder_funder_map[holder.owner] = {
+                "funder": funder,
+                "balance_pct": holder.pct,
+                "ui_amount": holder.ui_amount,
+            }
+
+    logger.info(f"[CLUSTER] Mapped {len(holder_funder_map)} holders to funders")
+
+    # Step 4: Group by funder — find cabals. Most funders fund a single
+    # holder, so walk a funder-sorted view and only build holder records for
+    # groups big enough to count. A cabal = same funder funded 3+ holders
+    clusters = []
+    cabal_funders = set()
+    cabal_holders = set()
+    funder_of = lambda item: item[1]["funder"]
+    for funder, group in groupby(sorted(holder_funder_map.items(), key=funder_of), key=funder_of):
+        group = list(group)
+        if len(group) < 3:
+            continue
+        funded_holders = [
+            {"wallet": wallet, "balance_pct": data["balance_pct"], "ui_amount": data["ui_amount"]}
+            for wallet, data in group
+        ]
+        clusters.append({
+            "funder": funder,
+            "holders": funded_holders,
+            "holder_count": len(funded_holders),
+            "combined_supply_pct": round(sum(h["balance_pct"] for h in funded_holders), 2),
+        })
+        cabal_funders.add(funder)
+        cabal_holders.update(wallet for wallet, _ in group)
 
-        # A cabal = same funder funded 3+ holders
-        clusters = []
-        for funder, funded_holders in funder_to_holders.items():
-            if len(funded_holders) >= 3:
-                total_pct = sum(h["balance_pct"] for h in funded_holders)
-                clusters.append({
-                    "funder": funder,
-                    "holders": funded_holders,
-                    "holder_count": len(funded_holders),
-                    "combined_supply_pct": round(total_pct, 2),
-                })
-
-        # Sort clusters by combined supply %
-        clusters.sort(key=lambda x: x["combined_supply_pct"], reverse=True)
-
-        # Step 5: Calculate cabal probability score
-        score = calculate_cabal_score(clusters, holders, holder_funder_map)
-
-        # Step 6: Build networkx graph
-        graph_data = build_graph(holder_funder_map, clusters, mint_address)
-
-        return {
-            "mint": mint_address,
-            "total_holders_scanned": len(holders),
-            "holders_with_known_funder": len(holder_funder_map),
-            "clusters": clusters,
-            "cluster_count": len(clusters),
-            "cabal_probability": score,
-            "holder_funder_map": holder_funder_map,
-            "graph": graph_data,
-        }
+    # Sort clusters by combined supply %
+    clusters.sort(key=itemgetter("combined_supply_pct"), reverse=True)
+
+    # Step 5: Calculate cabal probability score
+    score = calculate_cabal_score(clusters, holders, holder_funder_map, cabal_holders)
+
+    # Step 6: Build networkx graph
+    graph_data = build_graph(holder_funder_map, clusters, mint_address, cabal_holders, cabal_funders)
+
+    return {
+        "mint": mint_address,
+        "total_holders_scanned": len(holders),
+        "holders_with_known_funder": len(holder_funder_map),
+        "clusters": clusters,
+        "cluster_count": len(clusters),
+        "cabal_probability": score,
+        "holder_funder_map": holder_funder_map,
+        "graph": graph_data,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# JSON-RPC BATCHING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+RPC_BATCH_SIZE = 20  # stay well under provider batch caps
+# Helius free tier allows ~10 req/s; cap in-flight POSTs across all scans and
+# back off on 429 instead of failing the whole batch
+RPC_CONCURRENCY = 8
+RPC_RETRIES = 3
+RPC_BACKOFF = 0.5  # seconds, doubled per retry
+_rpc_sem = asyncio.Semaphore(RPC_CONCURRENCY)
+
+
+async def _rpc_batch(session: aiohttp.ClientSession, calls: list, timeout: float = 20) -> list:
+    """
+    Send [(method, params), ...] to Helius as JSON-RPC batches (one POST per
+    RPC_BATCH_SIZE calls, sent concurrently). Returns each call's `result` in
+    order, or None where that call or its whole POST failed.
+    """
+    async def _post(offset, chunk):
+        payload = [
+            {"jsonrpc": "2.0", "id": offset + i, "method": method, "params": params}
+            for i, (method, params) in enumerate(chunk)
+        ]
+        for attempt in range(RPC_RETRIES + 1):
+            async with _rpc_sem:
+                async with session.post(HELIUS_RPC, json=payload, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                    if resp.status != 429 or attempt == RPC_RETRIES:
+                        data = await resp.json()
+                        break
+            # Sleep outside the semaphore so other batches keep flowing
+            await asyncio.sleep(RPC_BACKOFF * 2 ** attempt)
+        return data if isinstance(data, list) else []
+
+    # A failed POST only loses its own chunk; the other chunks' results stand
+    replies = await asyncio.gather(*[
+        _post(i, calls[i:i + RPC_BATCH_SIZE]) for i in range(0, len(calls), RPC_BATCH_SIZE)
+    ], return_exceptions=True)
+    by_id = {}
+    for chunk in replies:
+        if isinstance(chunk, BaseException):
+            logger.warning(f"[CLUSTER] RPC batch chunk failed: {chunk!r}")
+            continue
+        for r in chunk:
+            by_id[r.get("id")] = r.get("result")
+    return [by_id.get(i) for i in range(len(calls))]
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # STEP 1 — GET TOP HOLDERS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-async def get_top_holders(session: aiohttp.ClientSession, mint: str) -> list:
-    try:
-        # Get total supply for % calculation
-        supply_payload = {
-            "jsonrpc": "2.0", "id": 1,
-            "method": "getTokenSupply",
-            "params": [mint]
-        }
-        async with session.post(HELIUS_RPC, json=supply_payload, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-            supply_data = await resp.json()
-        total_supply = float(
-            supply_data.get("result", {}).get("value", {}).get("uiAmount") or 1
-        )
+@dataclass(slots=True, frozen=True)
+class Holder:
+    """A top-holder owner wallet. Internal to the scan — results carry dicts."""
+    owner: str
+    ui_amount: float
+    pct: float
 
-        # Get top 20 token accounts
-        payload = {
-            "jsonrpc": "2.0", "id": 1,
-            "method": "getTokenLargestAccounts",
-            "params": [mint]
-        }
-        async with session.post(HELIUS_RPC, json=payload, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-            data = await resp.json()
 
-        accounts = data.get("result", {}).get("value", [])
+async def get_top_holders(session: aiohttp.ClientSession, mint: str) -> list:
+    try:
+        # Total supply (for % calculation) and top 20 token accounts, one round-trip
+        supply, largest = await _rpc_batch(session, [
+            ("getTokenSupply", [mint]),
+            ("getTokenLargestAccounts", [mint]),
+        ], timeout=10)
+        total_supply = float((supply or {}).get("value", {}).get("uiAmount") or 1)
+
+        accounts = (largest or {}).get("value", [])
         if not accounts:
             return []
 
@@ -163,11 +226,11 @@ async def get_top_holders(session: aiohttp.ClientSession, mint: str) -> list:
             owner = acc_info.get("data", {}).get("parsed", {}).get("info", {}).get("owner", "")
             ui_amt = float(token_acc.get("uiAmount") or 0)
             if owner and owner not in EXCLUDED_FUNDRS:
-                holders.append({
-                    "owner": owner,
-                    "ui_amount": ui_amt,
-                    "pct": round(ui_amt / total_supply * 100, 3) if total_supply > 0 else 0,
-                })
+                holders.append(Holder(
+                    owner=owner,
+                    ui_amount=ui_amt,
+                    pct=round(ui_amt / total_supply * 100, 3) if total_supply > 0 else 0,
+                ))
 
         return holders
 
@@ -180,97 +243,171 @@ async def get_top_holders(session: aiohttp.ClientSession, mint: str) -> list:
 # STEP 2 — FIND FUNDING WALLET
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# A wallet's first funding tx never changes, so funders (including "none
+# found") are cached across scans; transient RPC failures are not.
+FUNDER_CACHE_TTL = 86400
+_funder_cache = TTLCache(FUNDER_CACHE_TTL, maxsize=50_000)
+_UNSEEN = object()
+
+SIG_PAGE_SIZE = 1000
+MAX_SIG_PAGES = 3  # wallets older than this are exchanges/bots, not fresh cabal wallets
+
+
 async def get_funding_wallet(session: aiohttp.ClientSession, wallet: str) -> str:
     """
     Find the wallet that first funded this wallet with SOL.
     Looks at the oldest transaction and finds the SOL sender.
     """
+    return (await get_funding_wallets(session, [wallet]))[0]
+
+
+async def get_funding_wallets(session: aiohttp.ClientSession, wallets: list) -> list:
+    """
+    get_funding_wallet for many wallets in two batched round-trips: every
+    wallet's signatures in one POST, then every oldest transaction in another.
+    Returns funders (or None) in the same order as `wallets`.
+    """
+    funders = [None] * len(wallets)
+    todo = []
+    for i, w in enumerate(wallets):
+        hit = _funder_cache.get(w, _UNSEEN)
+        if hit is _UNSEEN:
+            todo.append(i)
+        else:
+            funders[i] = hit
+    if not todo:
+        return funders
+
     try:
-        # Get all signatures — we want the oldest (last in list)
-        sigs_payload = {
-            "jsonrpc": "2.0", "id": 1,
-            "method": "getSignaturesForAddress",
-            "params": [wallet, {"limit": 1000, "commitment": "finalized"}]
-        }
-        async with session.post(HELIUS_RPC, json=sigs_payload, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-            sigs_data = await resp.json()
+        # Walk each wallet's signatures back to the oldest (last in list).
+        # A full page means there may be older ones, so only those wallets
+        # fetch another page, up to MAX_SIG_PAGES.
+        last_sig = {}
+        truncated = set()  # a later page failed: the oldest sig may not be the first
+        active = todo
+        for page in range(MAX_SIG_PAGES):
+            sig_results = await _rpc_batch(session, [
+                ("getSignaturesForAddress", [wallets[i], {
+                    "limit": SIG_PAGE_SIZE, "commitment": "finalized",
+                    **({"before": last_sig[i]} if i in last_sig else {}),
+                }])
+                for i in active
+            ])
+            more = []
+            for i, sigs in zip(active, sig_results):
+                if sigs is None:
+                    truncated.add(i)  # call failed — keep what earlier pages found
+                    continue
+                if sigs:
+                    last_sig[i] = sigs[-1].get("signature")
+                elif page == 0:
+                    _funder_cache.set(wallets[i], None)  # no history to trace
+                if len(sigs) == SIG_PAGE_SIZE and last_sig[i]:
+                    more.append(i)
+            active = more
+            if not active:
+                break
 
-        sigs = sigs_data.get("result", [])
-        if not sigs:
-            return None
+        # First-page failures never reach last_sig, and truncated walks are
+        # returned but not cached, so neither sticks for FUNDER_CACHE_TTL
+        oldest = [(i, sig) for i, sig in last_sig.items() if sig]
+        if not oldest:
+            return funders
+
+        # Get the transactions. Plain "json" encoding skips the parsed
+        # instruction trees, which are most of a jsonParsed payload and unused
+        tx_results = await _rpc_batch(session, [
+            ("getTransaction", [sig, {"encoding": "json", "maxSupportedTransactionVersion": 0}])
+            for _, sig in oldest
+        ])
+        for (i, _), result in zip(oldest, tx_results):
+            if result:
+                funders[i] = _extract_funder(result, wallets[i])
+                if i not in truncated:
+                    _funder_cache.set(wallets[i], funders[i])
 
-        # Oldest = last signature
-        oldest_sig = sigs[-1].get("signature")
-        if not oldest_sig:
-            return None
+    except Exception as e:
+        logger.warning(f"[CLUSTER] get_funding_wallets error for {len(wallets)} wallets: {e}")
+    return funders
 
-        # Get the full transaction
-        tx_payload = {
-            "jsonrpc": "2.0", "id": 1,
-            "method": "getTransaction",
-            "params": [oldest_sig, {
-                "encoding": "jsonParsed",
-                "maxSupportedTransactionVersion": 0
-            }]
-        }
-        async with session.post(HELIUS_RPC, json=tx_payload, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-            tx_data = await resp.json()
 
-        result = tx_data.get("result")
-        if not result:
-            return None
+def _extract_key(key) -> tuple:
+    """(pubkey, signer, writable) for a jsonParsed or plain-string account key."""
+    if isinstance(key, dict):
+        return key.get("pubkey"), key.get("signer", False), key.get("writable", False)
+    return key, False, False
 
-        # Look for SOL transfer TO our wallet in this tx
-        message = result.get("transaction", {}).get("message", {})
-        account_keys = message.get("accountKeys", [])
-        instructions = message.get("instructions", [])
-
-        # Get pre/post balances to find who sent SOL to our wallet
-        pre_bals  = result.get("meta", {}).get("preBalances", [])
-        post_bals = result.get("meta", {}).get("postBalances", [])
-
-        # Find index of our wallet in account keys
-        wallet_idx = None
-        for i, key in enumerate(account_keys):
-            addr = key.get("pubkey") if isinstance(key, dict) else key
-            if addr == wallet:
-                wallet_idx = i
-                break
 
-        if wallet_idx is not None and wallet_idx < len(pre_bals):
-            our_pre  = pre_bals[wallet_idx]
-            our_post = post_bals[wallet_idx]
-            # Our wallet received SOL — find who sent it
-            if our_post > our_pre:
-                for i, (pre, post) in enumerate(zip(pre_bals, post_bals)):
-                    if post < pre and i != wallet_idx:
-                        sender_key = account_keys[i] if i < len(account_keys) else None
-                        if sender_key:
-                            sender = sender_key.get("pubkey") if isinstance(sender_key, dict) else sender_key
-                            if sender and sender not in EXCLUDED_FUNDRS:
-                                return sender
-
-        # Fallback: fee payer of creation tx is usually the funder
-        for key in account_keys:
-            addr = key.get("pubkey") if isinstance(key, dict) else key
-            signer = key.get("signer", False) if isinstance(key, dict) else False
-            writable = key.get("writable", False) if isinstance(key, dict) else False
-            if addr and addr != wallet and signer and writable:
-                if addr not in EXCLUDED_FUNDRS:
-                    return addr
-
-        return None
+def _account_keys(result: dict) -> list:
+    """
+    (pubkey, signer, writable) for every account in a transaction, in balance
+    order. jsonParsed keys carry the flags; plain "json" keys are derived from
+    the message header, followed by any lookup-table addresses (v0 txs).
+    """
+    message = result.get("transaction", {}).get("message", {})
+    static = message.get("accountKeys", [])
+    if not static or isinstance(static[0], dict):
+        return [_extract_key(k) for k in static]
+
+    header = message.get("header", {})
+    signed = header.get("numRequiredSignatures", 0)
+    writable_signed = signed - header.get("numReadonlySignedAccounts", 0)
+    writable_unsigned = len(static) - header.get("numReadonlyUnsignedAccounts", 0)
+    keys = [
+        (k, i < signed, i < writable_signed or signed <= i < writable_unsigned)
+        for i, k in enumerate(static)
+    ]
+    loaded = result.get("meta", {}).get("loadedAddresses") or {}
+    keys += [(k, False, True) for k in loaded.get("writable", [])]
+    keys += [(k, False, False) for k in loaded.get("readonly", [])]
+    return keys
+
+
+def _extract_funder(result: dict, wallet: str):
+    """Find the SOL sender to `wallet` in its parsed oldest transaction."""
+    # Look for SOL transfer TO our wallet in this tx
+    keys = _account_keys(result)
+
+    # Get pre/post balances to find who sent SOL to our wallet
+    pre_bals  = result.get("meta", {}).get("preBalances", [])
+    post_bals = result.get("meta", {}).get("postBalances", [])
+
+    # Find index of our wallet in account keys
+    wallet_idx = next((i for i, (addr, _, _) in enumerate(keys) if addr == wallet), None)
+
+    if wallet_idx is not None and wallet_idx < len(pre_bals):
+        our_pre  = pre_bals[wallet_idx]
+        our_post = post_bals[wallet_idx]
+        # Our wallet received SOL — the sender is the account with the largest
+        # outflow (a co-signer that only paid fees loses a few lamports)
+        if our_post > our_pre:
+            outflows = [
+                (post - pre, keys[i][0])
+                for i, (pre, post) in enumerate(zip(pre_bals, post_bals))
+                if post < pre and i != wallet_idx and i < len(keys)
+                and keys[i][0] and keys[i][0] not in EXCLUDED_FUNDRS
+            ]
+            if outflows:
+                return min(outflows, key=itemgetter(0))[1]
+
+    # Fallback: fee payer of creation tx is usually the funder
+    for addr, signer, writable in keys:
+        if addr and addr != wallet and signer and writable and addr not in EXCLUDED_FUNDRS:
+            return addr
 
-    except Exception as e:
-        logger.warning(f"[CLUSTER] get_funding_wallet error for {wallet[:8]}: {e}")
-        return None
+    return None
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # STEP 5 — CABAL PROBABILITY SCORE
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def calculate_cabal_score(clusters: list, holders: list, holder_funder_map: dict) -> int:
+def _cabal_holders(clusters: list) -> set:
+    return {h["wallet"] for c in clusters for h in c["holders"]}
+
+
+def calculate_cabal_score(clusters: list, holders: list, holder_funder_map: dict,
+                          cabal_holders: set = None) -> int:
     """
     Score 0–100 based on:
     - How many clusters exist
@@ -291,10 +428,8 @@ def calculate_cabal_score(clusters: list, holders: list, holder_funder_map: dict
     score += min(int(total_cabal_pct * 1.5), 40)
 
     # Factor 3: % of scanned holders that are in a cabal (max 30pts)
-    cabal_holders = set()
-    for c in clusters:
-        for h in c["holders"]:
-            cabal_holders.add(h["wallet"])
+    if cabal_holders is None:
+        cabal_holders = _cabal_holders(clusters)
 
     if holder_funder_map:
         cabal_ratio = len(cabal_holders) / len(holder_funder_map)
@@ -307,18 +442,18 @@ def calculate_cabal_score(clusters: list, holders: list, holder_funder_map: dict
 # STEP 6 — NETWORKX GRAPH
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def build_graph(holder_funder_map: dict, clusters: list, mint: str) -> dict:
+def build_graph(holder_funder_map: dict, clusters: list, mint: str,
+                cabal_holders: set = None, cabal_funders: set = None) -> dict:
     """
     Build a directed graph: funder → holder wallets.
-    Returns serializable graph data + networkx Graph object if available.
+    Returns serializable graph data; the networkx Graph is built on demand.
     """
     nodes = []
     edges = []
-    cabal_funders = {c["funder"] for c in clusters}
-    cabal_holders = set()
-    for c in clusters:
-        for h in c["holders"]:
-            cabal_holders.add(h["wallet"])
+    if cabal_funders is None:
+        cabal_funders = {c["funder"] for c in clusters}
+    if cabal_holders is None:
+        cabal_holders = _cabal_holders(clusters)
 
     # Add mint as root node
     nodes.append({"id": mint, "type": "mint", "label": f"TOKEN\n{mint[:8]}..."})
@@ -368,30 +503,73 @@ def build_graph(holder_funder_map: dict, clusters: list, mint: str) -> dict:
             "weight": pct,
         })
 
-    graph_data = {"nodes": nodes, "edges": edges}
+    # Nodes are deduplicated above and each holder contributes one edge of
+    # each type, so the counts match what networkx would report
+    n, m = len(nodes), len(edges)
+    return LazyGraph(
+        nodes=nodes,
+        edges=edges,
+        stats={"nodes": n, "edges": m, "density": round(m / (n * (n - 1)), 4) if n > 1 else 0},
+    )
+
 
-    # Build networkx graph if available
-    if HAS_NETWORKX:
+class LazyGraph(dict):
+    """
+    Serializable graph data ({"nodes", "edges", "stats"}). The networkx
+    DiGraph is only built if something asks for it — as `.networkx` or the
+    "networkx" key — since the bot report and JSON export never do.
+    """
+
+    @cached_property
+    def networkx(self):
+        if not HAS_NETWORKX:
+            return None
         G = nx.DiGraph()
-        for node in nodes:
-            G.add_node(node["id"], **{k: v for k, v in node.items() if k != "id"})
-        for edge in edges:
-            G.add_edge(edge["from"], edge["to"], **{k: v for k, v in edge.items() if k not in ("from", "to")})
-
-        graph_data["networkx"] = G
-        graph_data["stats"] = {
-            "nodes": G.number_of_nodes(),
-            "edges": G.number_of_edges(),
-            "density": round(nx.density(G), 4),
-        }
+        G.add_nodes_from((node["id"], {k: v for k, v in node.items() if k != "id"}) for node in self["nodes"])
+        G.add_edges_from(
+            (edge["from"], edge["to"], {k: v for k, v in edge.items() if k not in ("from", "to")})
+            for edge in self["edges"]
+        )
+        return G
 
-    return graph_data
+    def __missing__(self, key):
+        if key == "networkx" and HAS_NETWORKX:
+            return self.networkx
+        raise KeyError(key)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # REPORT FORMATTER
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _score_tier(score: int) -> tuple:
+    """(label, explanation) for a cabal probability score."""
+    if score >= 75:
+        return "🔴 VERY HIGH", "🔴 Strong evidence of coordinated wallet activity. These wallets were likely set up by the same entity and may dump together."
+    if score >= 50:
+        return "🟠 HIGH", "🟠 Significant clustering detected. Multiple holders share funding sources — possible team/insider coordination."
+    if score >= 25:
+        return "🟡 MODERATE", "🟡 Some clustering present. Could be exchange wallets, bots, or mild coordination. Monitor closely."
+    return "🟢 LOW", "🟢 Holder distribution looks organic. No significant cabal activity detected."
+
+
+def _render_cluster(i: int, cluster: dict) -> str:
+    funder  = cluster["funder"]
+    holders = cluster["holders"]
+    wallets = "".join(
+        f"\n  └ `{h['wallet'][:8]}...{h['wallet'][-4:]}` — `{h['balance_pct']}%`" for h in holders[:5]
+    )
+    more = f"\n  └ _...and {len(holders)-5} more_" if len(holders) > 5 else ""
+    return (
+        f"*Cluster #{i}*\n"
+        f"• Funder: `{funder[:8]}...{funder[-4:]}`\n"
+        f"  [Solscan](https://solscan.io/account/{funder})\n"
+        f"• Funded wallets: `{cluster['holder_count']}`\n"
+        f"• Combined supply: `{cluster['combined_supply_pct']}%`\n"
+        f"• Wallets:{wallets}{more}"
+    )
+
+
 def format_cluster_report(result: dict) -> str:
     if result.get("error"):
         return f"❌ {result['error']}"
@@ -403,67 +581,32 @@ def format_cluster_report(result: dict) -> str:
     cluster_count  = result.get("cluster_count", 0)
     score          = result.get("cabal_probability", 0)
     graph_stats    = result.get("graph", {}).get("stats", {})
-
-    if score >= 75:   score_label = "🔴 VERY HIGH"
-    elif score >= 50: score_label = "🟠 HIGH"
-    elif score >= 25: score_label = "🟡 MODERATE"
-    else:             score_label = "🟢 LOW"
-
-    lines = [
-        f"🕸 *WALLET CLUSTER REPORT*",
-        f"`{mint}`", f"",
-        f"*Cabal Probability: {score}/100 — {score_label}*", f"",
-        f"━━━ 📊 SCAN SUMMARY ━━━",
-        f"• Holders scanned: `{scanned}`",
-        f"• Funders identified: `{mapped}`",
-        f"• Cabal clusters found: `{cluster_count}`",
-    ]
-
-    if graph_stats:
-        lines.append(f"• Graph nodes/edges: `{graph_stats.get('nodes', 0)}/{graph_stats.get('edges', 0)}`")
-
-    lines.append(f"")
-
-    if not clusters:
-        lines.append("✅ No cabal clusters detected. Holder funding appears organic.")
-    else:
-        lines.append(f"━━━ 🚨 CABAL CLUSTERS ━━━")
-        for i, cluster in enumerate(clusters[:5], 1):
-            funder = cluster["funder"]
-            count  = cluster["holder_count"]
-            pct    = cluster["combined_supply_pct"]
-            lines += [
-                f"",
-                f"*Cluster #{i}*",
-                f"• Funder: `{funder[:8]}...{funder[-4:]}`",
-                f"  [Solscan](https://solscan.io/account/{funder})",
-                f"• Funded wallets: `{count}`",
-                f"• Combined supply: `{pct}%`",
-                f"• Wallets:",
-            ]
-            for h in cluster["holders"][:5]:
-                w = h["wallet"]
-                p = h["balance_pct"]
-                lines.append(f"  └ `{w[:8]}...{w[-4:]}` — `{p}%`")
-            if len(cluster["holders"]) > 5:
-                lines.append(f"  └ _...and {len(cluster['holders'])-5} more_")
-
-    lines += [
-        f"",
-        f"━━━ 💡 WHAT THIS MEANS ━━━",
-    ]
-
-    if score >= 75:
-        lines.append("🔴 Strong evidence of coordinated wallet activity. These wallets were likely set up by the same entity and may dump together.")
-    elif score >= 50:
-        lines.append("🟠 Significant clustering detected. Multiple holders share funding sources — possible team/insider coordination.")
-    elif score >= 25:
-        lines.append("🟡 Some clustering present. Could be exchange wallets, bots, or mild coordination. Monitor closely.")
+    score_label, meaning = _score_tier(score)
+
+    graph_line = (
+        f"\n• Graph nodes/edges: `{graph_stats.get('nodes', 0)}/{graph_stats.get('edges', 0)}`"
+        if graph_stats else ""
+    )
+    if clusters:
+        clusters_section = "━━━ 🚨 CABAL CLUSTERS ━━━\n\n" + "\n\n".join(
+            _render_cluster(i, c) for i, c in enumerate(clusters[:5], 1)
+        )
     else:
-        lines.append("🟢 Holder distribution looks organic. No significant cabal activity detected.")
-
-    lines += [f"", f"_Powered by Chain Sentinel • $CS_"]
-    return "\n".join(lines)
+        clusters_section = "✅ No cabal clusters detected. Holder funding appears organic."
+
+    return (
+        f"🕸 *WALLET CLUSTER REPORT*\n"
+        f"`{mint}`\n\n"
+        f"*Cabal Probability: {score}/100 — {score_label}*\n\n"
+        f"━━━ 📊 SCAN SUMMARY ━━━\n"
+        f"• Holders scanned: `{scanned}`\n"
+        f"• Funders identified: `{mapped}`\n"
+        f"• Cabal clusters found: `{cluster_count}`{graph_line}\n\n"
+        f"{clusters_section}\n\n"
+        f"━━━ 💡 WHAT THIS MEANS ━━━\n"
+        f"{meaning}\n\n"
+        f"_Powered by Chain Sentinel • $CS_"
+    )
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -475,7 +618,10 @@ async def main_standalone(mint: str):
     print(f"\n🕸 Chain Sentinel — Wallet Cluster Detector")
     print(f"Scanning: {mint}\n")
 
-    result = await find_wallet_clusters(mint)
+    try:
+        result = await find_wallet_clusters(mint)
+    finally:
+        await close_http_session()
     print(format_cluster_report(result))
 
     # Save full JSON (excluding networkx object)
@@ -483,8 +629,8 @@ async def main_standalone(mint: str):
     save_result["graph_nodes"] = result.get("graph", {}).get("nodes", [])
     save_result["graph_edges"] = result.get("graph", {}).get("edges", [])
 
-    with open("cluster_report.json", "w") as f:
-        json.dump(save_result, f, indent=2, default=str)
+    with open("cluster_report.json", "wb") as f:
+        f.write(dumps_pretty(save_result, default=str))
     print("\n✅ Full report saved to cluster_report.json")
 
 
@@ -493,4 +639,9 @@ if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python clusters.py <mint_address>")
         sys.exit(1)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(main_standalone(sys.argv[1]))
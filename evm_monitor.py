@@ -5,12 +5,13 @@ evm_monitor.py — Real-time monitor for Base (pump.fun) and Ethereum (Uniswap)
 import os
 import asyncio
 import aiohttp
-import json
 import logging
 import time
 import websockets
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Bot
 
+from http_client import get_http_session, loads, dumps
+
 logger = logging.getLogger(__name__)
 
 ALCHEMY_API_KEY = os.environ.get("ALCHEMY_API_KEY", "")
@@ -88,7 +89,7 @@ async def _monitor_chain(bot: Bot, chain: str):
                 logger.info(f"[EVM_MON] Connected to {chain}")
 
                 # Subscribe to Uniswap V2 PairCreated
-                await ws.send(json.dumps({
+                await ws.send(dumps({
                     "jsonrpc": "2.0", "id": 1,
                     "method": "eth_subscribe",
                     "params": ["logs", {
@@ -98,12 +99,12 @@ async def _monitor_chain(bot: Bot, chain: str):
                 }))
                 await ws.recv()  # subscription confirmation
 
-                async with aiohttp.ClientSession() as session:
-                    async for raw in ws:
-                        try:
-                            await _handle_evm_event(raw, session, bot, chain)
-                        except Exception as e:
-                            logger.warning(f"[EVM_MON] Event error: {e}")
+                session = await get_http_session()
+                async for raw in ws:
+                    try:
+                        await _handle_evm_event(raw, session, bot, chain)
+                    except Exception as e:
+                        logger.warning(f"[EVM_MON] Event error: {e}")
 
         except asyncio.CancelledError:
             break
@@ -117,7 +118,7 @@ async def _monitor_chain(bot: Bot, chain: str):
 # ═══════════════════════════════════════════════════════════════════════════════
 
 async def _handle_evm_event(raw: str, session: aiohttp.ClientSession, bot: Bot, chain: str):
-    msg = json.loads(raw)
+    msg = loads(raw)
     if "result" not in msg.get("params", {}):
         return
 
@@ -268,7 +269,7 @@ async def _send_evm_alert(bot: Bot, ca: str, chain: str, meta: dict, dev: dict,
     markup = InlineKeyboardMarkup(buttons)
     recipients = _evm_monitor_users | ({ADMIN_ID} if ADMIN_ID else set())
 
-    for chat_id in recipients:
+    async def _send(chat_id):
         try:
             await bot.send_message(
                 chat_id=chat_id,
@@ -280,6 +281,8 @@ async def _send_evm_alert(bot: Bot, ca: str, chain: str, meta: dict, dev: dict,
         except Exception as e:
             logger.warning(f"[EVM_MON] send error to {chat_id}: {e}")
 
+    await asyncio.gather(*(_send(chat_id) for chat_id in recipients))
+
     # Pass to sniper for legitimacy scoring
     try:
         from sniper import evaluate_and_alert
@@ -7,8 +7,14 @@ import os
 import asyncio
 import aiohttp
 import logging
+import random
 import time
+from bisect import bisect_left, bisect_right
 from collections import Counter
+from operator import itemgetter
+
+from http_client import get_http_session
+from cache import SingleFlight, TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +46,41 @@ CHAIN_CONFIG = {
 TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
 ZERO_TOPIC     = "0x0000000000000000000000000000000000000000000000000000000000000000"
 ZERO_ADDR      = "0x0000000000000000000000000000000000000000"
+ZERO_ADDR_HEX  = ZERO_ADDR[2:]  # a topic's last 40 hex chars for the zero address
+DEV_TX_WINDOW  = 60 * 86400     # only contracts deployed in the last 60 days count
+
+# Request timeouts, built once rather than per call
+_T_STD  = aiohttp.ClientTimeout(total=8,  connect=3)   # DexScreener, explorer lookups
+_T_SLOW = aiohttp.ClientTimeout(total=10, connect=3)   # single RPC reads, explorer txlist
+_T_MINT = aiohttp.ClientTimeout(total=12, connect=3)   # mint-log scan for the deployer
+_T_LOGS = aiohttp.ClientTimeout(total=15, connect=3)   # wide Transfer-log scans
+
+DEXSCREENER_TOKENS = "https://api.dexscreener.com/latest/dex/tokens/"
+# Meta and LP read the same DexScreener payload within one scan, and repeat
+# scans of a trending token land within seconds of each other
+DEX_CACHE_TTL = 30
+_dex_cache = TTLCache(DEX_CACHE_TTL, maxsize=2048)
+# Concurrent scans of the same token share one in-flight explorer/search call
+_inflight = SingleFlight()
+
+# DexScreener (300 req/min) and the explorers answer bursts with 429s; retry
+# those, 5xx and network errors a couple of times instead of losing the section
+HTTP_RETRIES    = 2      # extra attempts after the first
+RETRY_BASE      = 0.2    # seconds; full-jitter backoff, doubled per attempt
+RETRY_MAX       = 2.0
+RETRY_AFTER_MAX = 5.0    # cap on a server-sent Retry-After
+_RETRY_STATUS   = frozenset({429, 500, 502, 503, 504})
+
+DEX_CHUNK_SIZE        = 29  # /tokens/ accepts up to 30 comma-joined addresses
+DEX_CHUNK_CONCURRENCY = 5   # shared by all scans — keeps bursts under the rate limit
+_dex_chunk_sem = asyncio.Semaphore(DEX_CHUNK_CONCURRENCY)
+
+# A deployer's launch history changes slowly, and serial launchers get their
+# tokens scanned back to back — cache the deployer-level lookups and filter
+# out the scanned CA per call
+DEV_HISTORY_TTL = 600
+_dev_search_cache = TTLCache(DEV_HISTORY_TTL, maxsize=1024)
+_dev_creations_cache = TTLCache(DEV_HISTORY_TTL, maxsize=1024)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -47,14 +88,14 @@ ZERO_ADDR      = "0x0000000000000000000000000000000000000000"
 # ═══════════════════════════════════════════════════════════════════════════════
 
 async def scan_evm_token(ca: str, chain: str) -> dict:
-    async with aiohttp.ClientSession() as session:
-        meta, supply_data, lp_data, holder_data, dev_data = await asyncio.gather(
-            get_evm_token_meta(session, ca, chain),
-            get_evm_supply(session, ca, chain),
-            get_evm_lp(session, ca, chain),
-            get_evm_holders(session, ca, chain),
-            get_evm_dev_history(session, ca, chain),
-        )
+    session = await get_http_session()
+    meta, supply_data, lp_data, holder_data, dev_data = await asyncio.gather(
+        get_evm_token_meta(session, ca, chain),
+        get_evm_supply(session, ca, chain),
+        get_evm_lp(session, ca, chain),
+        get_evm_holders(session, ca, chain),
+        get_evm_dev_history(session, ca, chain),
+    )
 
     combined = {**supply_data, **lp_data, **holder_data}
     combined["token_name"]   = meta.get("name", "Unknown")
@@ -80,14 +121,101 @@ async def scan_evm_token(ca: str, chain: str) -> dict:
 # RPC HELPER
 # ═══════════════════════════════════════════════════════════════════════════════
 
-async def rpc_call(session, chain, method, params, timeout=10):
+async def rpc_call(session, chain, method, params, timeout=_T_SLOW):
     rpc = CHAIN_CONFIG[chain]["rpc"]
     payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
-    async with session.post(rpc, json=payload, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
-        data = await resp.json()
+    async with session.post(rpc, json=payload, timeout=timeout) as resp:
+        data = await resp.json(content_type=None)
     return data.get("result")
 
 
+async def rpc_batch(session, chain, calls, timeout=_T_SLOW):
+    """
+    Send [(method, params), ...] as one JSON-RPC batch POST. Returns each
+    call's result in order (None where it errored). Endpoints that reject
+    batches get the calls individually instead.
+    """
+    rpc = CHAIN_CONFIG[chain]["rpc"]
+    payload = [{"jsonrpc": "2.0", "id": i, "method": m, "params": p} for i, (m, p) in enumerate(calls)]
+    async with session.post(rpc, json=payload, timeout=timeout) as resp:
+        data = await resp.json(content_type=None)
+    if not isinstance(data, list):
+        return await asyncio.gather(*[rpc_call(session, chain, m, p, timeout) for m, p in calls])
+    by_id = {r.get("id"): r.get("result") for r in data if isinstance(r, dict)}
+    return [by_id.get(i) for i in range(len(calls))]
+
+
+def _backoff(attempt, resp=None):
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), RETRY_AFTER_MAX)
+        except ValueError:
+            pass  # HTTP-date form — fall back to our own schedule
+    return random.uniform(0, min(RETRY_MAX, RETRY_BASE * 2 ** attempt))
+
+
+async def _fetch_json(session, url, timeout=_T_STD, retries=HTTP_RETRIES):
+    """
+    GET `url`, retrying 429/5xx and network errors with jittered backoff.
+    Returns (status, json) — json is only decoded for a 200, else None.
+    """
+    for attempt in range(retries + 1):
+        last = attempt == retries
+        try:
+            resp = await session.get(url, timeout=timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if last:
+                raise
+            await asyncio.sleep(_backoff(attempt))
+            continue
+        async with resp:
+            if last or resp.status not in _RETRY_STATUS:
+                # content_type=None: DexScreener sometimes labels JSON text/plain
+                return resp.status, (await resp.json(content_type=None) if resp.status == 200 else None)
+            delay = _backoff(attempt, resp)
+        await asyncio.sleep(delay)
+
+
+def _slim_pair(p):
+    """
+    The few DexScreener pair fields the scanner reads. Full pairs carry txns,
+    priceChange, info, boosts, quoteToken… none of which should sit in the cache.
+    """
+    base = p.get("baseToken") or {}
+    return {
+        "chainId":  p.get("chainId"),
+        "dexId":    p.get("dexId", "unknown"),
+        "priceUsd": p.get("priceUsd", "0"),
+        # `liquidity`/`volume` can be an explicit null on fresh pairs
+        "liq":      float((p.get("liquidity") or {}).get("usd") or 0),
+        "vol24":    float((p.get("volume") or {}).get("h24") or 0),
+        "mc":       float(p.get("fdv") or p.get("marketCap") or 0),
+        "name":     base.get("name"),
+        "symbol":   base.get("symbol"),
+    }
+
+
+async def _dex_tokens(session, ca):
+    """Slim DexScreener pairs for `ca` (one or comma-joined addresses), cached briefly."""
+    async def load():
+        status, data = await _fetch_json(session, DEXSCREENER_TOKENS + ca)
+        if status != 200:
+            raise aiohttp.ClientError(f"DexScreener HTTP {status}")  # not cached
+        return [_slim_pair(p) for p in (data.get("pairs") or [])]
+    return await _dex_cache.get_or_load(ca.lower(), load)
+
+
+async def _fetch_dex_pairs(session, ca, chain_id):
+    """`ca`'s DexScreener pairs on `chain_id` — meta and LP share one cached fetch."""
+    return [p for p in await _dex_tokens(session, ca) if p["chainId"] == chain_id]
+
+
+async def _get_json(session, url, timeout):
+    """_fetch_json where identical concurrent requests share one call."""
+    return await _inflight.do(url, lambda: _fetch_json(session, url, timeout))
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # TOKEN METADATA
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -98,23 +226,19 @@ async def get_evm_token_meta(session, ca, chain):
 
     # DexScreener first — fastest
     try:
-        url = f"https://api.dexscreener.com/latest/dex/tokens/{ca}"
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=6)) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                pairs = [p for p in (data.get("pairs") or []) if p.get("chainId") == chain_id]
-                if pairs:
-                    t = pairs[0].get("baseToken", {})
-                    if t.get("name"):
-                        return {"name": t["name"], "symbol": t.get("symbol", "???")}
+        pairs = await _fetch_dex_pairs(session, ca, chain_id)
+        if pairs and pairs[0]["name"]:
+            return {"name": pairs[0]["name"], "symbol": pairs[0]["symbol"] or "???"}
     except Exception:
         pass
 
     # Fallback: read name() and symbol() directly from contract via eth_call
     # name() = 0x06fdde03, symbol() = 0x95d89b41
     try:
-        name_hex   = await rpc_call(session, chain, "eth_call", [{"to": ca, "data": "0x06fdde03"}, "latest"])
-        symbol_hex = await rpc_call(session, chain, "eth_call", [{"to": ca, "data": "0x95d89b41"}, "latest"])
+        name_hex, symbol_hex = await rpc_batch(session, chain, [
+            ("eth_call", [{"to": ca, "data": "0x06fdde03"}, "latest"]),
+            ("eth_call", [{"to": ca, "data": "0x95d89b41"}, "latest"]),
+        ])
 
         def decode_string(hex_val):
             if not hex_val or hex_val in ("0x", "0x0"): return None
@@ -146,20 +270,19 @@ async def get_evm_supply(session, ca, chain):
     try:
         rpc = CHAIN_CONFIG[chain]["rpc"]
 
-        # Get decimals
-        dec_hex = await rpc_call(session, chain, "eth_call", [{"to": ca, "data": "0x313ce567"}, "latest"])
+        # Decimals, total supply and latest block are independent — one batch POST
+        dec_hex, ts_hex, latest_hex = await rpc_batch(session, chain, [
+            ("eth_call", [{"to": ca, "data": "0x313ce567"}, "latest"]),
+            ("eth_call", [{"to": ca, "data": "0x18160ddd"}, "latest"]),
+            ("eth_blockNumber", []),
+        ])
         decimals = int(dec_hex, 16) if dec_hex and dec_hex not in ("0x", "0x0") else 18
-
-        # Get total supply
-        ts_hex = await rpc_call(session, chain, "eth_call", [{"to": ca, "data": "0x18160ddd"}, "latest"])
         total_raw = int(ts_hex, 16) if ts_hex and ts_hex not in ("0x", "0x0") else 0
         total_supply = total_raw / (10 ** decimals)
 
         if total_supply == 0:
             return _supply_defaults()
 
-        # Get latest block
-        latest_hex = await rpc_call(session, chain, "eth_blockNumber", [])
         latest = int(latest_hex, 16)
 
         # Scan Transfer logs — wider range for older tokens
@@ -173,7 +296,7 @@ async def get_evm_supply(session, ca, chain):
                     "topics": [TRANSFER_TOPIC],
                     "fromBlock": from_block,
                     "toBlock": "latest"
-                }], timeout=15)
+                }], timeout=_T_LOGS)
                 logs = result or []
                 logger.info(f"[EVM] supply logs: {len(logs)} at range {block_range}")
                 if logs:
@@ -187,7 +310,7 @@ async def get_evm_supply(session, ca, chain):
 
         # Build balance map
         balances = Counter()
-        zero40 = "0" * 40
+        zero40 = ZERO_ADDR_HEX
         for log in logs:
             topics = log.get("topics", [])
             if len(topics) < 3: continue
@@ -206,12 +329,13 @@ async def get_evm_supply(session, ca, chain):
         if not positive:
             return _supply_defaults()
 
+        # One sort serves top-k and Gini; Gini is scale-invariant, so the
+        # balances are used as-is instead of materialising a shares list
         total = sum(positive)
-        shares = [a / total for a in positive]
         return {
-            "top10_pct":    round(sum(shares[:10]) * 100, 1),
-            "top1_pct":     round(shares[0] * 100, 2),
-            "gini":         round(_gini(shares), 2),
+            "top10_pct":    round(sum(positive[:10]) / total * 100, 1),
+            "top1_pct":     round(positive[0] / total * 100, 2),
+            "gini":         round(_gini_sorted(positive, total), 2),
             "holder_count": len(positive),
         }
 
@@ -222,12 +346,13 @@ async def get_evm_supply(session, ca, chain):
 def _supply_defaults():
     return {"top10_pct": "N/A", "top1_pct": "N/A", "gini": "N/A", "holder_count": "N/A"}
 
-def _gini(shares):
-    if not shares: return 0
-    n, s = len(shares), sorted(shares)
-    cumsum = sum((2*(i+1) - n - 1) * x for i, x in enumerate(s))
-    total  = sum(s)
-    return cumsum / (n * total) if total > 0 else 0
+def _gini_sorted(desc, total):
+    """Gini of values already sorted largest-first, with their sum precomputed."""
+    n = len(desc)
+    if not n or total <= 0: return 0
+    # Ascending rank i (1-based) weights by 2i - n - 1; largest-first index j
+    # is rank n - j, so the weight becomes n - 1 - 2j
+    return sum((n - 1 - 2*j) * x for j, x in enumerate(desc)) / (n * total)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -237,18 +362,12 @@ def _gini(shares):
 async def get_evm_lp(session, ca, chain):
     try:
         chain_id = CHAIN_CONFIG[chain]["chain_id"]
-        url = f"https://api.dexscreener.com/latest/dex/tokens/{ca}"
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=8)) as resp:
-            if resp.status != 200: return _lp_defaults()
-            data = await resp.json()
-
-        pairs = [p for p in (data.get("pairs") or []) if p.get("chainId") == chain_id]
+        pairs = await _fetch_dex_pairs(session, ca, chain_id)
         if not pairs: return _lp_defaults()
 
-        pairs.sort(key=lambda p: float(p.get("liquidity", {}).get("usd") or 0), reverse=True)
-        best = pairs[0]
-        liq  = float(best.get("liquidity", {}).get("usd") or 0)
-        dex  = best.get("dexId", "unknown")
+        best = max(pairs, key=itemgetter("liq"))
+        liq  = best["liq"]
+        dex  = best["dexId"]
 
         if liq == 0:       status = "⚠ No liquidity found"
         elif liq < 1000:   status = f"🔴 Very low — ${liq:,.0f} (rug risk)"
@@ -260,9 +379,9 @@ async def get_evm_lp(session, ca, chain):
             "lp_locked":        status,
             "lp_lock_duration": "Verify on DexTools",
             "lp_liquidity_usd": liq,
-            "volume_24h":       float(best.get("volume", {}).get("h24") or 0),
-            "market_cap":       float(best.get("fdv") or best.get("marketCap") or 0),
-            "price":            best.get("priceUsd", "0"),
+            "volume_24h":       best["vol24"],
+            "market_cap":       best["mc"],
+            "price":            best["priceUsd"],
             "dex":              dex,
         }
     except Exception as e:
@@ -294,7 +413,7 @@ async def get_evm_holders(session, ca, chain):
                     "topics": [TRANSFER_TOPIC],
                     "fromBlock": from_block,
                     "toBlock": "latest"
-                }], timeout=15)
+                }], timeout=_T_LOGS)
                 logs = result or []
                 logger.info(f"[EVM] holder logs: {len(logs)} at range {block_range}")
                 if logs:
@@ -307,25 +426,26 @@ async def get_evm_holders(session, ca, chain):
             return _holder_defaults()
 
         wallets, fresh = set(), set()
-        sender_counts  = Counter()
-        zero40 = "0" * 40
+        sender_counts  = {}
+        clustered      = 0  # senders with 3+ transfers, counted as they cross
+        zero40 = ZERO_ADDR_HEX
 
         for log in logs:
             topics = log.get("topics", [])
             if len(topics) < 3: continue
             from_addr = topics[1][-40:].lower()
             to_addr   = topics[2][-40:].lower()
-            blk_num   = int(log.get("blockNumber", "0x0"), 16)
 
             if to_addr != zero40:
                 wallets.add(to_addr)
-                if blk_num >= cutoff_block: fresh.add(to_addr)
+                if int(log.get("blockNumber", "0x0"), 16) >= cutoff_block: fresh.add(to_addr)
             if from_addr != zero40:
                 wallets.add(from_addr)
-                sender_counts[from_addr] += 1
+                sent = sender_counts.get(from_addr, 0) + 1
+                sender_counts[from_addr] = sent
+                if sent == 3: clustered += 1
 
-        wc        = len(wallets)
-        clustered = sum(1 for c in sender_counts.values() if c >= 3)
+        wc = len(wallets)
 
         return {
             "wallet_count":     wc,
@@ -358,8 +478,8 @@ async def get_evm_dev_history(session, ca, chain):
         if cfg["key"]:
             try:
                 url = f"{cfg['api']}?module=contract&action=getcontractcreation&contractaddresses={ca}&apikey={cfg['key']}"
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=8)) as resp:
-                    data = await resp.json()
+                _, data = await _get_json(session, url, _T_STD)
+                data = data or {}
                 result = data.get("result", [])
                 logger.info(f"[EVM] contractcreation: status={data.get('status')} result={result}")
                 if isinstance(result, list) and result:
@@ -382,7 +502,7 @@ async def get_evm_dev_history(session, ca, chain):
                             "topics": [TRANSFER_TOPIC, ZERO_TOPIC],
                             "fromBlock": from_block,
                             "toBlock": "latest"
-                        }], timeout=12)
+                        }], timeout=_T_MINT)
                         mint_logs = result or []
                         if mint_logs:
                             break
@@ -404,19 +524,13 @@ async def get_evm_dev_history(session, ca, chain):
 
         # Find other tokens via DexScreener search by deployer
         deployed_tokens = []
+        ca_lower = ca.lower()
         try:
-            url = f"https://api.dexscreener.com/latest/dex/search?q={deployer}"
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=8)) as resp:
-                if resp.status == 200:
-                    sd = await resp.json()
-                    for pair in sd.get("pairs", []) or []:
-                        if pair.get("chainId") != chain_id: continue
-                        addr = pair.get("baseToken", {}).get("address", "").lower()
-                        if addr == ca.lower(): continue
-                        mc   = float(pair.get("fdv") or pair.get("marketCap") or 0)
-                        name = pair.get("baseToken", {}).get("name", "Unknown")
-                        sym  = pair.get("baseToken", {}).get("symbol", "???")
-                        deployed_tokens.append({"name": name, "symbol": sym, "mc": mc})
+            deployed_tokens = [
+                {"name": t["name"], "symbol": t["symbol"], "mc": t["mc"]}
+                for t in await _deployer_search(session, deployer, chain_id)
+                if t["address"] != ca_lower
+            ]
             logger.info(f"[EVM] deployer prev tokens via DexScreener: {len(deployed_tokens)}")
         except Exception as e:
             logger.warning(f"[EVM] DexScreener search error: {e}")
@@ -424,38 +538,35 @@ async def get_evm_dev_history(session, ca, chain):
         # Also try Etherscan tx list for deployed contracts
         if cfg["key"] and not deployed_tokens:
             try:
-                cutoff = int(time.time()) - (60 * 86400)
-                url = f"{cfg['api']}?module=account&action=txlist&address={deployer}&page=1&offset=100&sort=desc&apikey={cfg['key']}"
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                    tx_data = await resp.json()
-                txs = tx_data.get("result", [])
+                cutoff = int(time.time()) - DEV_TX_WINDOW
                 contracts = [
-                    tx.get("contractAddress", "")
-                    for tx in (txs if isinstance(txs, list) else [])
-                    if tx.get("to", "") == "" and int(tx.get("timeStamp", 0)) >= cutoff
-                    and tx.get("contractAddress") and tx.get("contractAddress").lower() != ca.lower()
+                    addr for addr, ts in await _deployer_creations(session, cfg, deployer)
+                    if ts >= cutoff and addr.lower() != ca_lower
                 ]
                 logger.info(f"[EVM] etherscan contracts: {len(contracts)}")
                 if contracts:
-                    chunks = [contracts[i:i+29] for i in range(0, min(len(contracts), 29), 29)]
-                    for chunk in chunks:
-                        url = f"https://api.dexscreener.com/latest/dex/tokens/{','.join(chunk)}"
-                        async with session.get(url, timeout=aiohttp.ClientTimeout(total=8)) as resp:
-                            dex = await resp.json()
-                        for pair in dex.get("pairs", []) or []:
-                            if pair.get("chainId") != chain_id: continue
-                            mc   = float(pair.get("fdv") or pair.get("marketCap") or 0)
-                            name = pair.get("baseToken", {}).get("name", "Unknown")
-                            sym  = pair.get("baseToken", {}).get("symbol", "???")
-                            deployed_tokens.append({"name": name, "symbol": sym, "mc": mc})
+                    async def _fetch_chunk(chunk):
+                        async with _dex_chunk_sem:
+                            return await _dex_tokens(session, ",".join(chunk))
+
+                    results = await asyncio.gather(*[
+                        _fetch_chunk(contracts[i:i + DEX_CHUNK_SIZE])
+                        for i in range(0, len(contracts), DEX_CHUNK_SIZE)
+                    ], return_exceptions=True)
+                    for dex in results:
+                        if isinstance(dex, Exception):
+                            logger.warning(f"[EVM] DexScreener chunk error: {dex}")
+                            continue
+                        for pair in dex:
+                            if pair["chainId"] != chain_id: continue
+                            deployed_tokens.append({
+                                "name": pair["name"] or "Unknown",
+                                "symbol": pair["symbol"] or "???",
+                                "mc": pair["mc"],
+                            })
             except Exception as e:
                 logger.warning(f"[EVM] etherscan tx list error: {e}")
 
-        def fmt(mc):
-            if mc >= 1_000_000: return f"${mc/1_000_000:.2f}M"
-            if mc >= 1_000:     return f"${mc/1_000:.1f}K"
-            return f"${mc:.0f}"
-
         total      = len(deployed_tokens)
         biggest_mc = max((t["mc"] for t in deployed_tokens), default=0)
         biggest    = next((t for t in deployed_tokens if t["mc"] == biggest_mc), {})
@@ -468,9 +579,9 @@ async def get_evm_dev_history(session, ca, chain):
         else:                            risk = "🟠 Low track record"
 
         tokens_sorted = sorted(deployed_tokens, key=lambda x: x["mc"], reverse=True)
-        token_lines   = [f"{i}. {t['name']} (${t['symbol']}) — {fmt(t['mc'])}"
+        token_lines   = [f"{i}. {t['name']} (${t['symbol']}) — {fmt_mc(t['mc'])}"
                          for i, t in enumerate(tokens_sorted[:5], 1)]
-        summary = (f"Deployer has {total} other token(s). Best: {biggest.get('name','?')} @ {fmt(biggest_mc)}."
+        summary = (f"Deployer has {total} other token(s). Best: {biggest.get('name','?')} @ {fmt_mc(biggest_mc)}."
                    if total else f"No other tokens found for this deployer on {chain_id.title()}.")
 
         return {
@@ -485,18 +596,58 @@ async def get_evm_dev_history(session, ca, chain):
         return empty
 
 
+async def _deployer_search(session, deployer, chain_id):
+    """Deployer's tokens on `chain_id` per DexScreener search, as {address, name, symbol, mc}."""
+    async def load():
+        url = f"https://api.dexscreener.com/latest/dex/search?q={deployer}"
+        status, sd = await _get_json(session, url, _T_STD)
+        if status != 200:
+            raise aiohttp.ClientError(f"DexScreener search HTTP {status}")  # not cached
+        tokens = []
+        for pair in sd.get("pairs", []) or []:
+            if pair.get("chainId") != chain_id: continue
+            base = pair.get("baseToken", {})
+            tokens.append({
+                "address": base.get("address", "").lower(),
+                "name":    base.get("name", "Unknown"),
+                "symbol":  base.get("symbol", "???"),
+                "mc":      float(pair.get("fdv") or pair.get("marketCap") or 0),
+            })
+        return tokens
+    return await _dev_search_cache.get_or_load((chain_id, deployer.lower()), load)
+
+
+async def _deployer_creations(session, cfg, deployer):
+    """(contractAddress, timestamp) for each contract the deployer created, per the explorer txlist."""
+    async def load():
+        url = f"{cfg['api']}?module=account&action=txlist&address={deployer}&page=1&offset=100&sort=desc&apikey={cfg['key']}"
+        _, tx_data = await _get_json(session, url, _T_SLOW)
+        txs = (tx_data or {}).get("result")
+        if not isinstance(txs, list):
+            # HTTP error or "Max rate limit reached" — don't cache it as "no contracts"
+            raise aiohttp.ClientError(f"txlist: {txs!r}")
+        return [
+            (tx["contractAddress"], int(tx.get("timeStamp", 0)))
+            for tx in txs if tx.get("to", "") == "" and tx.get("contractAddress")
+        ]
+    return await _dev_creations_cache.get_or_load((cfg["api"], deployer.lower()), load)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SCORING + SUMMARY
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Score bands: the score for a value is SCORES[bisect(THRESHOLDS, value)]
+_LP_THRESHOLDS    = (1000, 5000, 20000)   # liquidity USD, upper bounds (exclusive)
+_LP_SCORES        = (90, 70, 40, 20)
+_TOP10_THRESHOLDS = (30, 50, 80)          # top-10 share %, lower bounds (exclusive)
+_TOP10_SCORES     = (0, 20, 40, 60)
+
 def score_lp(d):
     try:
         liq = float(d.get("lp_liquidity_usd", 0))
-        if liq == 0:    return 80
-        if liq < 1000:  return 90
-        if liq < 5000:  return 70
-        if liq < 20000: return 40
-        return 20
+        if liq == 0: return 80  # no pool found at all
+        return _LP_SCORES[bisect_right(_LP_THRESHOLDS, liq)]
     except: return 50
 
 def score_supply(d):
@@ -504,7 +655,7 @@ def score_supply(d):
     top10 = d.get("top10_pct", 0)
     gini  = d.get("gini", 0)
     if isinstance(top10, (int, float)):
-        score += 60 if top10 > 80 else 40 if top10 > 50 else 20 if top10 > 30 else 0
+        score += _TOP10_SCORES[bisect_left(_TOP10_THRESHOLDS, top10)]
     if isinstance(gini, (int, float)):
         score += int(gini * 40)
     return min(score, 100)
@@ -517,11 +668,21 @@ def score_holders(d):
     if isinstance(cp, (int, float)): score += min(cp * 0.8, 50)
     return int(min(score, 100))
 
+_RISK_THRESHOLDS = (30, 60, 80)           # score upper bounds (inclusive)
+_RISK_LABELS     = ("🟢 Low", "🟡 Medium", "🟠 High", "🔴 Critical")
+
 def risk_label(s):
-    if s <= 30: return "🟢 Low"
-    if s <= 60: return "🟡 Medium"
-    if s <= 80: return "🟠 High"
-    return "🔴 Critical"
+    return _RISK_LABELS[bisect_left(_RISK_THRESHOLDS, s)]
+
+_MC_THRESHOLDS = (1_000, 1_000_000)
+_MC_FORMATS    = (
+    lambda mc: f"${mc:.0f}",
+    lambda mc: f"${mc/1_000:.1f}K",
+    lambda mc: f"${mc/1_000_000:.2f}M",
+)
+
+def fmt_mc(mc):
+    return _MC_FORMATS[bisect_right(_MC_THRESHOLDS, mc)](mc)
 
 def generate_evm_summary(d, ls, ss, hs):
     flags, advice = [], []
@@ -0,0 +1,78 @@
+"""
+http_client.py — Shared aiohttp session for Chain Sentinel.
+One pooled, keep-alive connector reused by every scanner instead of a fresh
+ClientSession (and TCP+TLS handshake) per request, plus the JSON codec (orjson
+when installed) shared by the HTTP layer and the on-disk stores.
+"""
+
+import json
+import aiohttp
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# aiohttp only uses the c-ares resolver when asked; without aiodns every
+# cache miss is a getaddrinfo call on the default thread pool
+try:
+    import aiodns  # noqa: F401
+    HAS_AIODNS = True
+except ImportError:
+    HAS_AIODNS = False
+
+if HAS_ORJSON:
+    def loads(s):
+        return orjson.loads(s)
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def dumps_pretty(obj, default=None) -> bytes:
+        """Indented UTF-8 JSON for files people may still open by hand."""
+        return orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+else:
+    loads = json.loads
+    dumps = json.dumps
+
+    def dumps_pretty(obj, default=None) -> bytes:
+        """Indented UTF-8 JSON for files people may still open by hand."""
+        return json.dumps(obj, indent=2, default=default).encode()
+
+
+class _Response(aiohttp.ClientResponse):
+    """ClientResponse whose .json() decodes with orjson when it's installed."""
+
+    async def json(self, *, encoding=None, loads=loads, content_type="application/json"):
+        return await super().json(encoding=encoding, loads=loads, content_type=content_type)
+
+
+_session = None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Return the process-wide ClientSession, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=200,
+            limit_per_host=32,
+            ttl_dns_cache=600,
+            keepalive_timeout=75,
+            resolver=aiohttp.AsyncResolver() if HAS_AIODNS else None,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            json_serialize=dumps,
+            response_class=_Response,
+        )
+    return _session
+
+
+async def close_http_session():
+    """Close the shared session (call once on shutdown)."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -3,46 +3,90 @@ invites.py — Single-use invite link system for Chain Sentinel
 Only the admin can generate links. Each link works exactly once.
 """
 
-import json
 import os
 import secrets
+import threading
+from itertools import islice
+
+from http_client import loads, dumps_pretty
 
 INVITES_FILE = "invites.json"
 USERS_FILE = "authorized_users.json"
 
+# The bot calls these from worker threads (asyncio.to_thread), so every
+# load-modify-save sequence runs under one lock.
+_lock = threading.Lock()
+
 
 # ── Invite storage ─────────────────────────────────────────────────────────
+# Cached after the first read, with a running count of redeemed invites so
+# /invites doesn't walk every token to summarise them.
+_invites: dict = None
+_used_count = 0
+
 def _load_invites() -> dict:
-    if not os.path.exists(INVITES_FILE):
-        return {}
-    with open(INVITES_FILE, "r") as f:
-        return json.load(f)
+    global _invites, _used_count
+    if _invites is None:
+        if os.path.exists(INVITES_FILE):
+            with open(INVITES_FILE, "rb") as f:
+                _invites = loads(f.read())
+        else:
+            _invites = {}
+        _used_count = sum(1 for v in _invites.values() if v["used"])
+    return _invites
 
 def _save_invites(data: dict):
-    with open(INVITES_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(INVITES_FILE, "wb") as f:
+        f.write(dumps_pretty(data))
 
 
 # ── Authorized users storage ───────────────────────────────────────────────
+# Checked on every command, so kept in memory as a set; the file is read once
+# and rewritten only when someone is authorized.
+_authorized: set = None
+
 def _load_users() -> list:
     if not os.path.exists(USERS_FILE):
         return []
-    with open(USERS_FILE, "r") as f:
-        return json.load(f)
+    with open(USERS_FILE, "rb") as f:
+        return loads(f.read())
 
 def _save_users(data: list):
-    with open(USERS_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(USERS_FILE, "wb") as f:
+        f.write(dumps_pretty(data))
+
+def _users() -> set:
+    global _authorized
+    if _authorized is None:
+        _authorized = set(_load_users())
+    return _authorized
+
+def _add_user(user_id: int):
+    users = _users()
+    if user_id not in users:
+        # Persist first, then publish: the bot reads this set lock-free from
+        # the event loop, so an id only appears once it is safely on disk.
+        _save_users(sorted(users | {user_id}))
+        users.add(user_id)
 
 
 # ── Public functions ───────────────────────────────────────────────────────
 def generate_invite() -> str:
     """Generate a new single-use invite token."""
-    token = secrets.token_urlsafe(16)
-    invites = _load_invites()
-    invites[token] = {"used": False}
-    _save_invites(invites)
-    return token
+    return generate_invites(1)[0]
+
+
+def generate_invites(n: int) -> list:
+    """Generate n single-use invite tokens with a single write to disk."""
+    tokens = [secrets.token_urlsafe(16) for _ in range(n)]
+    with _lock:
+        invites = _load_invites()
+        # Persist first, then publish, so a failed write leaves the cache
+        # matching the file
+        _save_invites({**invites, **{token: {"used": False} for token in tokens}})
+        for token in tokens:
+            invites[token] = {"used": False}
+    return tokens
 
 
 def use_invite(token: str, user_id: int) -> bool:
@@ -50,44 +94,57 @@ def use_invite(token: str, user_id: int) -> bool:
     Attempt to redeem an invite token for a user.
     Returns True if successful, False if invalid or already used.
     """
-    invites = _load_invites()
+    global _used_count
+    with _lock:
+        invites = _load_invites()
 
-    if token not in invites:
-        return False
-    if invites[token]["used"]:
-        return False
+        if token not in invites:
+            return False
+        if invites[token]["used"]:
+            return False
 
-    # Mark invite as used
-    invites[token]["used"] = True
-    invites[token]["redeemed_by"] = user_id
-    _save_invites(invites)
+        # Mark invite as used — on disk first, so a failed write leaves the
+        # cache and _used_count untouched and the token still redeemable
+        record = {**invites[token], "used": True, "redeemed_by": user_id}
+        _save_invites({**invites, token: record})
+        invites[token] = record
+        _used_count += 1
 
-    # Authorize the user
-    users = _load_users()
-    if user_id not in users:
-        users.append(user_id)
-        _save_users(users)
+        # Authorize the user
+        _add_user(user_id)
 
     return True
 
 
 def is_authorized(user_id: int) -> bool:
     """Check if a user is authorized to use the bot."""
-    return user_id in _load_users()
+    return user_id in _users()
+
+
+def authorized_set() -> set:
+    """Live set of authorized user ids, for O(1) membership checks."""
+    return _users()
 
 
 def authorize_user(user_id: int):
     """Directly authorize a user (for admin)."""
-    users = _load_users()
-    if user_id not in users:
-        users.append(user_id)
-        _save_users(users)
+    with _lock:
+        _add_user(user_id)
 
 
 def list_invites() -> dict:
     """Return all invites and their status."""
-    return _load_invites()
+    with _lock:
+        return dict(_load_invites())
+
+
+def invite_summary(recent: int = 10) -> tuple:
+    """Return (total, used, [(token, used), ...]) for the `recent` newest invites."""
+    with _lock:
+        invites = _load_invites()
+        last = [(token, meta["used"]) for token, meta in islice(reversed(invites.items()), recent)]
+        return len(invites), _used_count, last[::-1]
 
 
 def get_authorized_users() -> list:
-    return _load_users()
+    return list(_users())
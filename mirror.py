@@ -6,11 +6,12 @@ Tracks smart money wallets and alerts when they buy, with position sizing advice
 import os
 import asyncio
 import aiohttp
-import json
 import logging
 import time
 from collections import defaultdict
 
+from http_client import get_http_session, loads, dumps_pretty
+
 logger = logging.getLogger(__name__)
 
 HELIUS_API_KEY = os.environ.get("HELIUS_API_KEY", "")
@@ -27,21 +28,32 @@ STORAGE_FILE = "mirror_data.json"
 # STORAGE
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Loaded once; user ids are ints in memory and only become string keys when
+# the file is written.
+_data: dict = None
+
 def _load() -> dict:
-    try:
-        with open(STORAGE_FILE, "r") as f:
-            return json.load(f)
-    except Exception:
-        return {"wallets": {}, "budgets": {}, "active": {}}
+    global _data
+    if _data is None:
+        try:
+            with open(STORAGE_FILE, "rb") as f:
+                raw = loads(f.read())
+        except Exception:
+            raw = {}
+        _data = {
+            section: {int(uid): v for uid, v in raw.get(section, {}).items()}
+            for section in ("wallets", "budgets", "active")
+        }
+    return _data
 
 def _save(data: dict):
-    with open(STORAGE_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(STORAGE_FILE, "wb") as f:
+        f.write(dumps_pretty(data))
 
 def add_mirror_wallet(user_id: int, wallet: str, chain: str, label: str = "") -> bool:
     """Add a wallet to mirror for a user."""
     data = _load()
-    uid  = str(user_id)
+    uid  = user_id
     if uid not in data["wallets"]:
         data["wallets"][uid] = {}
     wallet = wallet.lower() if chain != "solana" else wallet
@@ -56,7 +68,7 @@ def add_mirror_wallet(user_id: int, wallet: str, chain: str, label: str = "") ->
 
 def remove_mirror_wallet(user_id: int, wallet: str) -> bool:
     data = _load()
-    uid  = str(user_id)
+    uid  = user_id
     wallet_lower = wallet.lower()
     if uid in data["wallets"]:
         # Match case-insensitively
@@ -69,16 +81,16 @@ def remove_mirror_wallet(user_id: int, wallet: str) -> bool:
 
 def set_budget(user_id: int, amount_usd: float):
     data = _load()
-    data["budgets"][str(user_id)] = amount_usd
+    data["budgets"][user_id] = amount_usd
     _save(data)
 
 def get_budget(user_id: int) -> float:
     data = _load()
-    return float(data["budgets"].get(str(user_id), 0))
+    return float(data["budgets"].get(user_id, 0))
 
 def get_user_wallets(user_id: int) -> dict:
     data = _load()
-    return data["wallets"].get(str(user_id), {})
+    return data["wallets"].get(user_id, {})
 
 def get_all_tracked_wallets() -> dict:
     """Returns {wallet: [(user_id, chain, label), ...]}"""
@@ -86,12 +98,12 @@ def get_all_tracked_wallets() -> dict:
     index = defaultdict(list)
     for uid, wallets in data["wallets"].items():
         for wallet, info in wallets.items():
-            index[wallet].append((int(uid), info["chain"], info["label"]))
+            index[wallet].append((uid, info["chain"], info["label"]))
     return dict(index)
 
 def increment_trade_count(user_id: int, wallet: str):
     data = _load()
-    uid  = str(user_id)
+    uid  = user_id
     if uid in data["wallets"] and wallet in data["wallets"][uid]:
         data["wallets"][uid][wallet]["trades"] = data["wallets"][uid][wallet].get("trades", 0) + 1
         _save(data)
@@ -298,32 +310,32 @@ async def build_mirror_alert(
     trade: dict, user_budget_usd: float
 ) -> dict:
     """Build mirror alert data for a single trade."""
-    async with aiohttp.ClientSession() as session:
-        # Get wallet's total native balance in USD
-        wallet_balance_usd = await get_wallet_balance_usd(session, wallet, chain)
-
-        # Get native asset price
-        if chain == "solana":
-            native_price = await _get_sol_price(session)
-            native_sym   = "SOL"
-        else:
-            native_price = await _get_eth_price(session)
-            native_sym   = "ETH"
+    session = await get_http_session()
+    # Get wallet's total native balance in USD
+    wallet_balance_usd = await get_wallet_balance_usd(session, wallet, chain)
+
+    # Get native asset price
+    if chain == "solana":
+        native_price = await _get_sol_price(session)
+        native_sym   = "SOL"
+    else:
+        native_price = await _get_eth_price(session)
+        native_sym   = "ETH"
 
-        # How much they spent in USD
-        spent_native = trade.get("spent_native", 0)
-        spent_usd    = spent_native * native_price
+    # How much they spent in USD
+    spent_native = trade.get("spent_native", 0)
+    spent_usd    = spent_native * native_price
 
-        # What % of their bag did they put in
-        conviction_pct = (spent_usd / wallet_balance_usd * 100) if wallet_balance_usd > 0 else 0
+    # What % of their bag did they put in
+    conviction_pct = (spent_usd / wallet_balance_usd * 100) if wallet_balance_usd > 0 else 0
 
-        # Mirror sizing: same % of user's budget
-        mirror_usd    = user_budget_usd * (conviction_pct / 100)
-        mirror_native = mirror_usd / native_price if native_price > 0 else 0
+    # Mirror sizing: same % of user's budget
+    mirror_usd    = user_budget_usd * (conviction_pct / 100)
+    mirror_native = mirror_usd / native_price if native_price > 0 else 0
 
-        # Get token name
-        token_ca   = trade.get("token", "")
-        token_name = await _get_token_name(session, token_ca, chain)
+    # Get token name
+    token_ca   = trade.get("token", "")
+    token_name = await _get_token_name(session, token_ca, chain)
 
     return {
         "wallet":           wallet,
@@ -396,62 +408,62 @@ async def _poll_all_wallets(bot):
 
     logger.info(f"[MIRROR] Polling {len(all_wallets)} wallets...")
 
-    async with aiohttp.ClientSession() as session:
-        for wallet, subscribers in all_wallets.items():
-            try:
-                chain = subscribers[0][1]  # all subscribers share same chain
-                trades = await get_recent_trades(session, wallet, chain, limit=5)
+    session = await get_http_session()
+    for wallet, subscribers in all_wallets.items():
+        try:
+            chain = subscribers[0][1]  # all subscribers share same chain
+            trades = await get_recent_trades(session, wallet, chain, limit=5)
 
-                if not trades:
-                    continue
+            if not trades:
+                continue
 
-                # Check for new trades since last poll
-                latest_id = trades[0].get("sig") or trades[0].get("tx_hash", "")
-                last_id   = _last_seen.get(wallet)
+            # Check for new trades since last poll
+            latest_id = trades[0].get("sig") or trades[0].get("tx_hash", "")
+            last_id   = _last_seen.get(wallet)
 
-                if last_id is None:
-                    # First poll — just record, don't alert
-                    _last_seen[wallet] = latest_id
-                    continue
+            if last_id is None:
+                # First poll — just record, don't alert
+                _last_seen[wallet] = latest_id
+                continue
 
-                if latest_id == last_id:
-                    continue  # nothing new
+            if latest_id == last_id:
+                continue  # nothing new
 
-                # Find new trades
-                new_trades = []
-                for t in trades:
-                    tid = t.get("sig") or t.get("tx_hash", "")
-                    if tid == last_id:
-                        break
-                    new_trades.append(t)
+            # Find new trades
+            new_trades = []
+            for t in trades:
+                tid = t.get("sig") or t.get("tx_hash", "")
+                if tid == last_id:
+                    break
+                new_trades.append(t)
 
-                _last_seen[wallet] = latest_id
+            _last_seen[wallet] = latest_id
 
-                # Alert each subscriber for each new buy
-                for trade in new_trades:
-                    if trade.get("type") != "BUY":
+            # Alert each subscriber for each new buy
+            for trade in new_trades:
+                if trade.get("type") != "BUY":
+                    continue
+                for (user_id, _, label) in subscribers:
+                    budget = get_budget(user_id)
+                    if budget <= 0:
                         continue
-                    for (user_id, _, label) in subscribers:
-                        budget = get_budget(user_id)
-                        if budget <= 0:
-                            continue
-                        try:
-                            alert = await build_mirror_alert(wallet, label, chain, trade, budget)
-                            msg   = format_mirror_alert(alert)
-                            await bot.send_message(
-                                chat_id=user_id,
-                                text=msg,
-                                parse_mode="Markdown",
-                                disable_web_page_preview=True
-                            )
-                            increment_trade_count(user_id, wallet)
-                            logger.info(f"[MIRROR] Alert sent to {user_id} for {wallet[:8]}")
-                        except Exception as e:
-                            logger.warning(f"[MIRROR] alert send error: {e}")
-
-            except Exception as e:
-                logger.warning(f"[MIRROR] wallet poll error {wallet[:8]}: {e}")
-            await asyncio.sleep(1)  # small delay between wallets
+                    try:
+                        alert = await build_mirror_alert(wallet, label, chain, trade, budget)
+                        msg   = format_mirror_alert(alert)
+                        await bot.send_message(
+                            chat_id=user_id,
+                            text=msg,
+                            parse_mode="Markdown",
+                            disable_web_page_preview=True
+                        )
+                        increment_trade_count(user_id, wallet)
+                        logger.info(f"[MIRROR] Alert sent to {user_id} for {wallet[:8]}")
+                    except Exception as e:
+                        logger.warning(f"[MIRROR] alert send error: {e}")
+
+        except Exception as e:
+            logger.warning(f"[MIRROR] wallet poll error {wallet[:8]}: {e}")
+        await asyncio.sleep(1)  # small delay between wallets
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -11,6 +11,8 @@ import logging
 import time
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Bot
 
+from http_client import get_http_session
+
 logger = logging.getLogger(__name__)
 
 HELIUS_API_KEY  = os.environ.get("HELIUS_API_KEY", "")
@@ -49,21 +51,21 @@ async def run_monitor(bot: Bot):
 
     while True:
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{PUMP_API}/coins?offset=0&limit=20&sort=created_timestamp&order=DESC&includeNsfw=true"
-                async with session.get(
-                    url,
-                    headers={"User-Agent": "Mozilla/5.0"},
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as resp:
-                    if resp.status == 429:
-                        logger.warning("[MONITOR] pump.fun rate limited, waiting 30s...")
-                        await asyncio.sleep(30)
-                        continue
-                    if resp.status != 200:
-                        await asyncio.sleep(15)
-                        continue
-                    coins = await resp.json()
+            session = await get_http_session()
+            url = f"{PUMP_API}/coins?offset=0&limit=20&sort=created_timestamp&order=DESC&includeNsfw=true"
+            async with session.get(
+                url,
+                headers={"User-Agent": "Mozilla/5.0"},
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as resp:
+                if resp.status == 429:
+                    logger.warning("[MONITOR] pump.fun rate limited, waiting 30s...")
+                    await asyncio.sleep(30)
+                    continue
+                if resp.status != 200:
+                    await asyncio.sleep(15)
+                    continue
+                coins = await resp.json()
 
             if not isinstance(coins, list) or not coins:
                 await asyncio.sleep(10)
@@ -110,43 +112,43 @@ async def _process_launch_from_coin(coin: dict, bot: Bot, start_time: float):
     if not mint:
         return
     try:
-        async with aiohttp.ClientSession() as local_session:
-            # Build meta directly from coin data
-            meta = {
-                "name":     coin.get("name", "Unknown"),
-                "symbol":   coin.get("symbol", "???"),
-                "twitter":  coin.get("twitter", ""),
-                "telegram": coin.get("telegram", ""),
-                "website":  coin.get("website", ""),
-                "image":    coin.get("image_uri", ""),
-            }
-
-            # Get dev alpha in parallel
-            dev_data = await get_dev_alpha_for_monitor(local_session, coin.get("creator", ""))
-
-            has_twitter  = bool(meta.get("twitter"))
-            has_telegram = bool(meta.get("telegram"))
-
-            if not (has_twitter or has_telegram):
-                logger.info(f"[MONITOR] {mint[:8]}... skipped — no socials")
-                # Still pass to sniper for evaluation
-                try:
-                    from sniper import evaluate_and_alert
-                    asyncio.ensure_future(evaluate_and_alert(bot, mint, "solana"))
-                except Exception:
-                    pass
-                return
-
-            elapsed = round((time.time() - start_time) * 1000)
-            await send_launch_alert(bot, mint, meta, dev_data, coin.get("creator", ""),
-                                    "", elapsed, has_twitter, has_telegram)
-
-            # Pass to sniper
+        local_session = await get_http_session()
+        # Build meta directly from coin data
+        meta = {
+            "name":     coin.get("name", "Unknown"),
+            "symbol":   coin.get("symbol", "???"),
+            "twitter":  coin.get("twitter", ""),
+            "telegram": coin.get("telegram", ""),
+            "website":  coin.get("website", ""),
+            "image":    coin.get("image_uri", ""),
+        }
+
+        # Get dev alpha in parallel
+        dev_data = await get_dev_alpha_for_monitor(local_session, coin.get("creator", ""))
+
+        has_twitter  = bool(meta.get("twitter"))
+        has_telegram = bool(meta.get("telegram"))
+
+        if not (has_twitter or has_telegram):
+            logger.info(f"[MONITOR] {mint[:8]}... skipped — no socials")
+            # Still pass to sniper for evaluation
             try:
                 from sniper import evaluate_and_alert
                 asyncio.ensure_future(evaluate_and_alert(bot, mint, "solana"))
-            except Exception as e:
-                logger.warning(f"[MONITOR] sniper hook error: {e}")
+            except Exception:
+                pass
+            return
+
+        elapsed = round((time.time() - start_time) * 1000)
+        await send_launch_alert(bot, mint, meta, dev_data, coin.get("creator", ""),
+                                "", elapsed, has_twitter, has_telegram)
+
+        # Pass to sniper
+        try:
+            from sniper import evaluate_and_alert
+            asyncio.ensure_future(evaluate_and_alert(bot, mint, "solana"))
+        except Exception as e:
+            logger.warning(f"[MONITOR] sniper hook error: {e}")
 
     except asyncio.CancelledError:
         pass
@@ -155,47 +157,46 @@ async def _process_launch_from_coin(coin: dict, bot: Bot, start_time: float):
 
 
 async def _process_launch(sig: str, session: aiohttp.ClientSession, bot: Bot, start_time: float):
-    # Use a fresh session per launch to avoid closed session errors
     try:
-        async with aiohttp.ClientSession() as local_session:
-            mint, metadata_uri, creator = await get_launch_details(local_session, sig)
-            if not mint:
-                return
+        local_session = await get_http_session()
+        mint, metadata_uri, creator = await get_launch_details(local_session, sig)
+        if not mint:
+            return
 
-            if mint in _seen_mints:
-                return
-            _seen_mints.add(mint)
+        if mint in _seen_mints:
+            return
+        _seen_mints.add(mint)
 
-            logger.info(f"[MONITOR] New token: {mint[:8]}... by {str(creator)[:8]}...")
+        logger.info(f"[MONITOR] New token: {mint[:8]}... by {str(creator)[:8]}...")
 
-            try:
-                meta, dev_data = await asyncio.wait_for(
-                    asyncio.gather(
-                        fetch_metadata(local_session, mint, metadata_uri),
-                        get_dev_alpha_for_monitor(local_session, creator),
-                    ),
-                    timeout=5.0
-                )
-            except asyncio.TimeoutError:
-                logger.warning(f"[MONITOR] Timeout enriching {mint[:8]}...")
-                return
-
-            has_twitter  = bool(meta.get("twitter"))
-            has_telegram = bool(meta.get("telegram"))
-
-            if not (has_twitter or has_telegram):
-                logger.info(f"[MONITOR] {mint[:8]}... skipped — no socials")
-                return
-
-            elapsed = round((time.time() - start_time) * 1000)
-            await send_launch_alert(bot, mint, meta, dev_data, creator, sig, elapsed, has_twitter, has_telegram)
-
-            # Pass to sniper for legitimacy scoring
-            try:
-                from sniper import evaluate_and_alert
-                asyncio.ensure_future(evaluate_and_alert(bot, mint, "solana", sig))
-            except Exception as e:
-                logger.warning(f"[MONITOR] sniper hook error: {e}")
+        try:
+            meta, dev_data = await asyncio.wait_for(
+                asyncio.gather(
+                    fetch_metadata(local_session, mint, metadata_uri),
+                    get_dev_alpha_for_monitor(local_session, creator),
+                ),
+                timeout=5.0
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"[MONITOR] Timeout enriching {mint[:8]}...")
+            return
+
+        has_twitter  = bool(meta.get("twitter"))
+        has_telegram = bool(meta.get("telegram"))
+
+        if not (has_twitter or has_telegram):
+            logger.info(f"[MONITOR] {mint[:8]}... skipped — no socials")
+            return
+
+        elapsed = round((time.time() - start_time) * 1000)
+        await send_launch_alert(bot, mint, meta, dev_data, creator, sig, elapsed, has_twitter, has_telegram)
+
+        # Pass to sniper for legitimacy scoring
+        try:
+            from sniper import evaluate_and_alert
+            asyncio.ensure_future(evaluate_and_alert(bot, mint, "solana", sig))
+        except Exception as e:
+            logger.warning(f"[MONITOR] sniper hook error: {e}")
 
     except asyncio.CancelledError:
         pass
@@ -482,8 +483,9 @@ async def send_launch_alert(
     markup = InlineKeyboardMarkup(buttons)
 
     # Send to all monitoring users + admin
-    recipients = _monitor_users | {ADMIN_ID} if ADMIN_ID else _monitor_users
-    for chat_id in recipients:
+    recipients = _monitor_users | {ADMIN_ID} if ADMIN_ID else set(_monitor_users)
+
+    async def _send(chat_id):
         try:
             await bot.send_message(
                 chat_id=chat_id,
@@ -496,6 +498,9 @@ async def send_launch_alert(
         except Exception as e:
             logger.warning(f"[MONITOR] Failed to send to {chat_id}: {e}")
 
+    # Fan out concurrently; the bot's rate limiter paces the actual sends
+    await asyncio.gather(*(_send(chat_id) for chat_id in recipients))
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # USER MANAGEMENT — who receives live alerts
@@ -10,6 +10,9 @@ logger = logging.getLogger(__name__)
 import aiohttp
 import time
 
+from http_client import get_http_session
+from cache import TTLCache
+
 HELIUS_API_KEY = os.environ.get("HELIUS_API_KEY", "")
 BIRDEYE_API_KEY = os.environ.get("BIRDEYE_API_KEY", "")
 
@@ -21,24 +24,24 @@ BIRDEYE_API = "https://public-api.birdeye.so"
 # ── Main entry ────────────────────────────────────────────────────────────────
 async def scan_token(ca: str) -> dict:
     logger.info(f"[SCAN] Starting scan for {ca[:8]}... HELIUS_RPC={HELIUS_RPC[:40]}")
-    async with aiohttp.ClientSession() as session:
-        # Quick RPC health check
-        try:
-            test = {"jsonrpc": "2.0", "id": 1, "method": "getHealth", "params": []}
-            async with session.post(HELIUS_RPC, json=test, timeout=aiohttp.ClientTimeout(total=5)) as r:
-                health = await r.json()
-            logger.info(f"[SCAN] Helius health: status={r.status} result={health.get('result','?')}")
-        except Exception as e:
-            logger.error(f"[SCAN] Helius unreachable: {e}")
-
-        wallet_data, lp_data, supply_data, mev_data, dev_data, token_meta = await asyncio.gather(
-            scan_wallets(session, ca),
-            scan_lp(session, ca),
-            scan_supply(session, ca),
-            scan_mev(session, ca),
-            get_dev_alpha(ca),
-            get_token_meta(session, ca),
-        )
+    session = await get_http_session()
+    # Quick RPC health check
+    try:
+        test = {"jsonrpc": "2.0", "id": 1, "method": "getHealth", "params": []}
+        async with session.post(HELIUS_RPC, json=test, timeout=aiohttp.ClientTimeout(total=5)) as r:
+            health = await r.json()
+        logger.info(f"[SCAN] Helius health: status={r.status} result={health.get('result','?')}")
+    except Exception as e:
+        logger.error(f"[SCAN] Helius unreachable: {e}")
+
+    wallet_data, lp_data, supply_data, mev_data, dev_data, token_meta = await asyncio.gather(
+        scan_wallets(session, ca),
+        scan_lp(session, ca),
+        scan_supply(session, ca),
+        scan_mev(session, ca),
+        get_dev_alpha(ca),
+        get_token_meta(session, ca),
+    )
     logger.info(f"[SCAN] Results — wallets={wallet_data} supply={supply_data}")
 
     combined = {**wallet_data, **lp_data, **supply_data, **mev_data}
@@ -505,6 +508,34 @@ def generate_summary(d, ws, ls, ss, ms) -> str:
 # DEV ALPHA — finds the deployer and their full launch history
 # ═══════════════════════════════════════════════════════════════════════════════
 
+DEV_HISTORY_TTL = 600
+
+# A mint's deployer never changes, and a deployer's launch history is the same
+# whichever of their tokens is being scanned — so it is cached per deployer.
+_deployer_cache = TTLCache(86400, maxsize=8192)
+_dev_history_cache = TTLCache(DEV_HISTORY_TTL, maxsize=1024)
+
+
+async def _dev_history(session: aiohttp.ClientSession, deployer: str, ca: str) -> list:
+    """Enriched launch history for `deployer`, shared across their tokens."""
+    entry = _dev_history_cache.get(deployer)
+    if entry is not None and ca not in entry["cas"]:
+        # A CA the cached history doesn't know about is likely a newer launch
+        _dev_history_cache.pop(deployer)
+        entry = None
+
+    if entry is None:
+        async def load():
+            tokens = await get_deployed_tokens(session, deployer)
+            logger.info(f"[DEV] found {len(tokens)} deployed tokens")
+            enriched = await enrich_with_dexscreener(session, tokens) if tokens else []
+            return {"tokens": enriched, "cas": {t["mint"] for t in enriched}}
+
+        entry = await _dev_history_cache.get_or_load(deployer, load)
+        entry["cas"].add(ca)
+    return entry["tokens"]
+
+
 async def get_dev_alpha(ca: str) -> dict:
     """
     Full dev history analysis:
@@ -513,34 +544,31 @@ async def get_dev_alpha(ca: str) -> dict:
     3. Cross-reference with DexScreener for peak market caps
     4. Return a structured report
     """
-    import logging
-    logger = logging.getLogger(__name__)
-
-    async with aiohttp.ClientSession() as session:
-        # Step 1: get deployer wallet
+    session = await get_http_session()
+    # Step 1: get deployer wallet
+    deployer = _deployer_cache.get(ca)
+    if deployer is None:
         deployer = await get_deployer(session, ca)
-        logger.info(f"[DEV] deployer={deployer}")
-
-        if not deployer:
-            return {"error": "Could not identify deployer wallet."}
+        if deployer:
+            _deployer_cache.set(ca, deployer)
+    logger.info(f"[DEV] deployer={deployer}")
 
-        # Step 2: get all tokens they deployed
-        tokens = await get_deployed_tokens(session, deployer)
-        logger.info(f"[DEV] found {len(tokens)} deployed tokens")
+    if not deployer:
+        return {"error": "Could not identify deployer wallet."}
 
-        if not tokens:
-            return {
-                "deployer": deployer,
-                "token_count": 0,
-                "tokens": [],
-                "summary": f"Deployer `{deployer[:6]}...{deployer[-4:]}` has no other token launches found in recent history."
-            }
+    # Steps 2-3: all tokens they deployed, enriched with DexScreener data
+    enriched = await _dev_history(session, deployer, ca)
 
-        # Step 3: enrich with DexScreener data
-        enriched = await enrich_with_dexscreener(session, tokens)
+    if not enriched:
+        return {
+            "deployer": deployer,
+            "token_count": 0,
+            "tokens": [],
+            "summary": f"Deployer {deployer[:6]}...{deployer[-4:]} has no other token launches found in recent history."
+        }
 
-        # Step 4: build report
-        return build_dev_report(deployer, ca, enriched)
+    # Step 4: build report
+    return build_dev_report(deployer, ca, enriched)
 
 
 # ── Step 1: Find deployer ─────────────────────────────────────────────────────
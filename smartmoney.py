@@ -6,11 +6,12 @@ Finds wallets that appear across multiple successful tokens, filters by PnL & wi
 import os
 import asyncio
 import aiohttp
-import json
 import time
 import logging
 from collections import defaultdict
 
+from http_client import get_http_session, close_http_session, dumps_pretty
+
 logger = logging.getLogger(__name__)
 
 HELIUS_API_KEY = os.environ.get("HELIUS_API_KEY", "")
@@ -34,57 +35,57 @@ async def find_smart_money(mints: list, min_win_rate: float = 0.60, min_pnl_sol:
     if len(mints) > 5:
         mints = mints[:5]
 
-    async with aiohttp.ClientSession() as session:
-
-        # ── Step 1: Get top holders for each mint ─────────────────────────────
-        logger.info(f"[SM] Fetching holders for {len(mints)} tokens...")
-        holder_lists = await asyncio.gather(*[
-            get_top_holders(session, mint) for mint in mints
-        ])
-
-        # ── Step 2: Find intersection (wallets in 2+ lists) ───────────────────
-        common = find_intersection(holder_lists, mints, min_appearances=2)
-        logger.info(f"[SM] Found {len(common)} common wallets")
-
-        if not common:
-            return {
-                "error": "No common wallets found across these tokens. Try tokens with more overlap.",
-                "holder_counts": [len(h) for h in holder_lists],
-            }
-
-        # Limit to top 30 wallets to avoid rate limits
-        common_wallets = list(common.keys())[:30]
-
-        # ── Step 3: Calculate PnL for each common wallet ───────────────────────
-        logger.info(f"[SM] Calculating PnL for {len(common_wallets)} wallets...")
-        pnl_results = await asyncio.gather(*[
-            calculate_wallet_pnl(session, wallet, mints) for wallet in common_wallets
-        ])
-
-        # ── Step 4: Filter by win rate and PnL ────────────────────────────────
-        qualified = []
-        for wallet, pnl_data in zip(common_wallets, pnl_results):
-            if pnl_data is None:
-                continue
-            win_rate = pnl_data.get("win_rate", 0)
-            total_pnl = pnl_data.get("total_pnl_sol", 0)
-            if win_rate >= min_win_rate and total_pnl >= min_pnl_sol:
-                pnl_data["wallet"] = wallet
-                pnl_data["tokens_held"] = common[wallet]
-                qualified.append(pnl_data)
+    session = await get_http_session()
 
-        # Sort by total PnL descending
-        qualified.sort(key=lambda x: x.get("total_pnl_sol", 0), reverse=True)
-        logger.info(f"[SM] {len(qualified)} wallets passed filters")
+    # ── Step 1: Get top holders for each mint ─────────────────────────────────
+    logger.info(f"[SM] Fetching holders for {len(mints)} tokens...")
+    holder_lists = await asyncio.gather(*[
+        get_top_holders(session, mint) for mint in mints
+    ])
 
+    # ── Step 2: Find intersection (wallets in 2+ lists) ───────────────────────
+    common = find_intersection(holder_lists, mints, min_appearances=2)
+    logger.info(f"[SM] Found {len(common)} common wallets")
+
+    if not common:
         return {
-            "mints_analyzed": mints,
-            "total_common_wallets": len(common),
-            "qualified_wallets": qualified[:10],  # top 10
-            "min_win_rate": min_win_rate,
-            "min_pnl_sol": min_pnl_sol,
+            "error": "No common wallets found across these tokens. Try tokens with more overlap.",
+            "holder_counts": [len(h) for h in holder_lists],
         }
 
+    # Limit to top 30 wallets to avoid rate limits
+    common_wallets = list(common.keys())[:30]
+
+    # ── Step 3: Calculate PnL for each common wallet ───────────────────────────
+    logger.info(f"[SM] Calculating PnL for {len(common_wallets)} wallets...")
+    pnl_results = await asyncio.gather(*[
+        calculate_wallet_pnl(session, wallet, mints) for wallet in common_wallets
+    ])
+
+    # ── Step 4: Filter by win rate and PnL ────────────────────────────────────
+    qualified = []
+    for wallet, pnl_data in zip(common_wallets, pnl_results):
+        if pnl_data is None:
+            continue
+        win_rate = pnl_data.get("win_rate", 0)
+        total_pnl = pnl_data.get("total_pnl_sol", 0)
+        if win_rate >= min_win_rate and total_pnl >= min_pnl_sol:
+            pnl_data["wallet"] = wallet
+            pnl_data["tokens_held"] = common[wallet]
+            qualified.append(pnl_data)
+
+    # Sort by total PnL descending
+    qualified.sort(key=lambda x: x.get("total_pnl_sol", 0), reverse=True)
+    logger.info(f"[SM] {len(qualified)} wallets passed filters")
+
+    return {
+        "mints_analyzed": mints,
+        "total_common_wallets": len(common),
+        "qualified_wallets": qualified[:10],  # top 10
+        "min_win_rate": min_win_rate,
+        "min_pnl_sol": min_pnl_sol,
+    }
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # STEP 1 — GET TOP HOLDERS
@@ -372,7 +373,10 @@ async def main_standalone(mints: list):
     print(f"\n🧠 Chain Sentinel — Smart Money Finder")
     print(f"Analysing {len(mints)} tokens...\n")
 
-    result = await find_smart_money(mints, min_win_rate=0.60, min_pnl_sol=10.0)
+    try:
+        result = await find_smart_money(mints, min_win_rate=0.60, min_pnl_sol=10.0)
+    finally:
+        await close_http_session()
 
     if result.get("error"):
         print(f"Error: {result['error']}")
@@ -381,8 +385,8 @@ async def main_standalone(mints: list):
     print(format_smart_money_report(result))
 
     # Also save full JSON report
-    with open("smart_money_report.json", "w") as f:
-        json.dump(result, f, indent=2, default=str)
+    with open("smart_money_report.json", "wb") as f:
+        f.write(dumps_pretty(result, default=str))
     print("\n✅ Full report saved to smart_money_report.json")
 
 
@@ -396,4 +400,9 @@ if __name__ == "__main__":
         sys.exit(1)
 
     input_mints = sys.argv[1:]
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(main_standalone(input_mints))
@@ -11,6 +11,8 @@ import json
 import logging
 import time
 
+from http_client import get_http_session
+
 logger = logging.getLogger(__name__)
 
 HELIUS_API_KEY = os.environ.get("HELIUS_API_KEY", "")
@@ -660,8 +662,8 @@ async def evaluate_and_alert(bot, ca: str, chain: str, sig: str = ""):
 
     logger.info(f"[SNIPER] ⚡ Evaluating {ca[:8]}... on {chain} for {len(active_users)} user(s)")
 
-    async with aiohttp.ClientSession() as session:
-        checks = await run_legitimacy_checks(session, ca, chain)
+    session = await get_http_session()
+    checks = await run_legitimacy_checks(session, ca, chain)
 
     for user_id, filters in active_users:
         # Check if this chain is enabled for user
@@ -725,55 +727,55 @@ async def _poll_new_launches(bot):
     """Poll pump.fun and Base for new launches."""
     global _last_pump_token
 
-    async with aiohttp.ClientSession() as session:
-        # ── Solana: poll pump.fun latest coins ──
+    session = await get_http_session()
+    # ── Solana: poll pump.fun latest coins ──
+    try:
+        url = f"{PUMP_API}/coins?offset=0&limit=20&sort=created_timestamp&order=DESC&includeNsfw=true"
+        async with session.get(url, headers={"User-Agent": "Mozilla/5.0"},
+                               timeout=aiohttp.ClientTimeout(total=8)) as resp:
+            if resp.status == 200:
+                coins = await resp.json()
+                if isinstance(coins, list) and coins:
+                    latest_mint = coins[0].get("mint", "")
+
+                    if _last_pump_token is None:
+                        _last_pump_token = latest_mint
+                        logger.info(f"[SNIPER] Poller initialized at {latest_mint[:8]}...")
+                    elif latest_mint != _last_pump_token:
+                        # Find all new tokens since last check
+                        new_coins = []
+                        for coin in coins:
+                            mint = coin.get("mint", "")
+                            if mint == _last_pump_token:
+                                break
+                            if mint and mint not in _seen:
+                                new_coins.append(coin)
+
+                        _last_pump_token = latest_mint
+                        logger.info(f"[SNIPER] Poller found {len(new_coins)} new Solana token(s)")
+
+                        for coin in new_coins[:5]:  # max 5 per poll cycle
+                            mint = coin.get("mint", "")
+                            if mint:
+                                asyncio.ensure_future(evaluate_and_alert(bot, mint, "solana"))
+    except Exception as e:
+        logger.warning(f"[SNIPER] pump.fun poll error: {e}")
+
+    # ── Base: poll DexScreener for new pairs ──
+    active_users = get_active_users()
+    base_users = [u for u in active_users if "base" in u[1].get("chains", [])]
+    if base_users:
         try:
-            url = f"{PUMP_API}/coins?offset=0&limit=20&sort=created_timestamp&order=DESC&includeNsfw=true"
-            async with session.get(url, headers={"User-Agent": "Mozilla/5.0"},
-                                   timeout=aiohttp.ClientTimeout(total=8)) as resp:
+            url = "https://api.dexscreener.com/token-profiles/latest/v1"
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=8)) as resp:
                 if resp.status == 200:
-                    coins = await resp.json()
-                    if isinstance(coins, list) and coins:
-                        latest_mint = coins[0].get("mint", "")
-
-                        if _last_pump_token is None:
-                            _last_pump_token = latest_mint
-                            logger.info(f"[SNIPER] Poller initialized at {latest_mint[:8]}...")
-                        elif latest_mint != _last_pump_token:
-                            # Find all new tokens since last check
-                            new_coins = []
-                            for coin in coins:
-                                mint = coin.get("mint", "")
-                                if mint == _last_pump_token:
-                                    break
-                                if mint and mint not in _seen:
-                                    new_coins.append(coin)
-
-                            _last_pump_token = latest_mint
-                            logger.info(f"[SNIPER] Poller found {len(new_coins)} new Solana token(s)")
-
-                            for coin in new_coins[:5]:  # max 5 per poll cycle
-                                mint = coin.get("mint", "")
-                                if mint:
-                                    asyncio.ensure_future(evaluate_and_alert(bot, mint, "solana"))
+                    profiles = await resp.json()
+                    if isinstance(profiles, list):
+                        for p in profiles[:10]:
+                            if p.get("chainId") != "base":
+                                continue
+                            ca = p.get("tokenAddress", "")
+                            if ca and ca not in _seen:
+                                asyncio.ensure_future(evaluate_and_alert(bot, ca, "base"))
         except Exception as e:
-            logger.warning(f"[SNIPER] pump.fun poll error: {e}")
-
-        # ── Base: poll DexScreener for new pairs ──
-        active_users = get_active_users()
-        base_users = [u for u in active_users if "base" in u[1].get("chains", [])]
-        if base_users:
-            try:
-                url = "https://api.dexscreener.com/token-profiles/latest/v1"
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=8)) as resp:
-                    if resp.status == 200:
-                        profiles = await resp.json()
-                        if isinstance(profiles, list):
-                            for p in profiles[:10]:
-                                if p.get("chainId") != "base":
-                                    continue
-                                ca = p.get("tokenAddress", "")
-                                if ca and ca not in _seen:
-                                    asyncio.ensure_future(evaluate_and_alert(bot, ca, "base"))
-            except Exception as e:
-                logger.warning(f"[SNIPER] Base poll error: {e}")
+            logger.warning(f"[SNIPER] Base poll error: {e}")
@@ -1,47 +1,81 @@
 """
 watchlist.py — Persistent watchlist with risk-change alerts
-Stores data in a local JSON file (works fine for small scale).
+Stores data in a local JSON file (works fine for small scale), cached in memory
+and flushed to disk in the background.
 """
 
-import json
 import os
 import asyncio
 from scanner import scan_token
+from http_client import loads, dumps_pretty
 
 WATCHLIST_FILE = "watchlist.json"
+SCAN_CONCURRENCY = 5
 
+# Loaded once and kept in memory; mutations only mark the store dirty and
+# flush_watchlist() (run periodically by the bot) writes it back to disk.
+_data: dict = None
+_dirty = False
 
-def _load() -> dict:
-    if not os.path.exists(WATCHLIST_FILE):
-        return {}
-    with open(WATCHLIST_FILE, "r") as f:
-        return json.load(f)
-
-
-def _save(data: dict):
-    with open(WATCHLIST_FILE, "w") as f:
-        json.dump(data, f, indent=2)
 
-
-def add_to_watchlist(user_id: str, ca: str):
+def _load() -> dict:
+    global _data
+    if _data is None:
+        if os.path.exists(WATCHLIST_FILE):
+            # JSON object keys are strings; user ids are ints everywhere else
+            with open(WATCHLIST_FILE, "rb") as f:
+                _data = {int(uid): tokens for uid, tokens in loads(f.read()).items()}
+        else:
+            _data = {}
+    return _data
+
+
+def _write(payload: bytes):
+    tmp = WATCHLIST_FILE + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, WATCHLIST_FILE)
+
+
+def _mark_dirty():
+    global _dirty
+    _dirty = True
+
+
+async def flush_watchlist():
+    """Persist the watchlist if it changed since the last flush."""
+    global _dirty
+    if not _dirty:
+        return
+    _dirty = False
+    # Serialize on the loop so the snapshot is consistent, write off it
+    payload = dumps_pretty(_load())
+    try:
+        await asyncio.to_thread(_write, payload)
+    except Exception:
+        _dirty = True
+        raise
+
+
+def add_to_watchlist(user_id: int, ca: str):
     data = _load()
     if user_id not in data:
         data[user_id] = {}
     # Store CA with last known risk score
     data[user_id][ca] = data[user_id].get(ca, {"last_score": None})
-    _save(data)
+    _mark_dirty()
 
 
-def remove_from_watchlist(user_id: str, ca: str) -> bool:
+def remove_from_watchlist(user_id: int, ca: str) -> bool:
     data = _load()
     if user_id in data and ca in data[user_id]:
         del data[user_id][ca]
-        _save(data)
+        _mark_dirty()
         return True
     return False
 
 
-def get_watchlist(user_id: str) -> list:
+def get_watchlist(user_id: int) -> list:
     data = _load()
     return list(data.get(user_id, {}).keys())
 
@@ -54,35 +88,44 @@ async def check_watchlist_alerts() -> list:
     data = _load()
     alerts = []
 
-    for user_id, tokens in data.items():
-        for ca, meta in tokens.items():
-            try:
-                result = await scan_token(ca)
-                new_score = result.get("risk_score", 0)
-                last_score = meta.get("last_score")
+    # Snapshot: users can /watch or /unwatch while we await scans
+    snapshot = [(uid, list(tokens.items())) for uid, tokens in data.items()]
+    cas = list({ca for _, tokens in snapshot for ca, _ in tokens})
 
-                # Update stored score
-                data[user_id][ca]["last_score"] = new_score
+    # One scan per CA no matter how many users watch it, a few at a time
+    sem = asyncio.Semaphore(SCAN_CONCURRENCY)
 
-                if last_score is None:
-                    continue  # First scan, no alert yet
+    async def _check_one(ca):
+        async with sem:
+            return await scan_token(ca)
 
-                change = new_score - last_score
+    results = await asyncio.gather(*[_check_one(ca) for ca in cas], return_exceptions=True)
+    scores = dict(zip(cas, results))
 
-                if abs(change) >= 15:
-                    direction = "📈 INCREASED" if change > 0 else "📉 DECREASED"
-                    alert_msg = (
-                        f"Risk score {direction} by {abs(change)} points\n"
-                        f"Previous: {last_score}/100 → Now: {new_score}/100\n\n"
-                        f"AI Note: {result.get('ai_summary', '')}"
-                    )
-                    alerts.append((user_id, ca, alert_msg))
+    for user_id, tokens in snapshot:
+        for ca, meta in tokens:
+            result = scores.get(ca)
+            if isinstance(result, BaseException) or result is None:
+                continue
+            new_score = result.get("risk_score", 0)
+            last_score = meta.get("last_score")
 
-                # Small delay to avoid rate limits
-                await asyncio.sleep(2)
+            # Update stored score
+            meta["last_score"] = new_score
+            _mark_dirty()
 
-            except Exception:
-                continue
+            if last_score is None:
+                continue  # First scan, no alert yet
+
+            change = new_score - last_score
+
+            if abs(change) >= 15:
+                direction = "📈 INCREASED" if change > 0 else "📉 DECREASED"
+                alert_msg = (
+                    f"Risk score {direction} by {abs(change)} points\n"
+                    f"Previous: {last_score}/100 → Now: {new_score}/100\n\n"
+                    f"AI Note: {result.get('ai_summary', '')}"
+                )
+                alerts.append((user_id, ca, alert_msg))
 
-    _save(data)
     return alerts